@@ -60,6 +60,8 @@ async def connect_to_mongodb(max_retries: int = 3):
         await db.workers.create_index("zone_id")
         await db.workers.create_index("assigned_shift")
         await db.workers.create_index("is_active")
+        await db.workers.create_index([("mine_id", 1), ("is_active", 1), ("compliance_score", 1)])
+        await db.workers.create_index([("is_active", 1), ("compliance_score", 1)])
 
         # Mines collection
         await db.mines.create_index("name")
@@ -77,6 +79,13 @@ async def connect_to_mongodb(max_retries: int = 3):
         # Gate entries collection
         await db.gate_entries.create_index([("gate_id", 1), ("timestamp", -1)])
         await db.gate_entries.create_index([("worker_id", 1), ("timestamp", -1)])
+        await db.gate_entries.create_index([("mine_id", 1), ("timestamp", -1)])
+        await db.gate_entries.create_index([("mine_id", 1), ("gate_id", 1), ("timestamp", -1)])
+        await db.gate_entries.create_index([("mine_id", 1), ("timestamp", -1), ("worker_id", 1)])
+        await db.gate_entries.create_index([("mine_id", 1), ("zone_id", 1), ("timestamp", -1)])
+        await db.gate_entries.create_index([("mine_id", 1), ("shift", 1), ("timestamp", -1)])
+        await db.gate_entries.create_index([("mine_id", 1), ("worker_id", 1), ("timestamp", -1)])
+        await db.gate_entries.create_index([("worker_id", 1), ("entry_type", 1), ("timestamp", -1)])
         await db.gate_entries.create_index("timestamp")
         await db.gate_entries.create_index("shift")
         await db.gate_entries.create_index("status")
@@ -86,6 +95,8 @@ async def connect_to_mongodb(max_retries: int = 3):
         await db.alerts.create_index("status")
         await db.alerts.create_index("severity")
         await db.alerts.create_index("alert_type")
+        await db.alerts.create_index([("severity", 1), ("created_at", -1)])
+        await db.alerts.create_index([("mine_id", 1), ("alert_type", 1), ("created_at", -1)])
 
         # PPE configurations collection
         await db.ppe_configs.create_index([("mine_id", 1), ("zone_id", 1)], unique=True)
@@ -129,6 +140,15 @@ async def connect_to_mongodb(max_retries: int = 3):
         await db.report_schedules.create_index("mine_id")
         await db.report_schedules.create_index("is_active")
         await db.report_schedules.create_index("next_run")
+        await db.report_schedules.create_index([("created_by", 1), ("created_at", -1)])
+        await db.report_schedules.create_index([("mine_id", 1), ("created_at", -1)])
+        await db.report_schedules.create_index([("is_active", 1), ("next_run", 1)])
+
+        # Daily gate entry rollups (maintained by the report scheduler)
+        await db.daily_rollups.create_index([("mine_id", 1), ("date", 1)])
+        await db.daily_rollups.create_index("date")
+        await db.daily_violation_rollups.create_index([("mine_id", 1), ("date", 1)])
+        await db.daily_violation_rollups.create_index("date")
 
         # Report history collection
         await db.report_history.create_index([("schedule_id", 1), ("generated_at", -1)])
@@ -3,7 +3,11 @@ Main FastAPI application for PPE detection, face recognition, and attendance sys
 With Role-Based Access Control (RBAC) for mine safety management.
 """
 import os
+import sys
 import base64
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from io import BytesIO
 from datetime import datetime, timedelta
 from typing import Optional, List
@@ -48,10 +52,27 @@ from services.helmet_service import start_helmet_reader
 
 load_dotenv()
 
+# Report services log through a queue; the listener thread does the stdout
+# writes so they never block the event loop.
+_report_log_queue = queue.SimpleQueue()
+_report_log_handler = logging.StreamHandler(sys.stdout)
+_report_log_handler.setFormatter(logging.Formatter("%(levelname)s [%(name)s] %(message)s"))
+_report_log_listener = QueueListener(_report_log_queue, _report_log_handler)
+_reports_logger = logging.getLogger("reports")
+_reports_logger.setLevel(logging.INFO)
+_reports_logger.addHandler(QueueHandler(_report_log_queue))
+_reports_logger.propagate = False
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
+    _report_log_listener.start()
+
+    # Fail fast if the report cache is misconfigured (e.g. several workers without Redis)
+    from reports.services.report_cache import get_report_cache
+    get_report_cache()
+
     await connect_to_mongodb()
     await initialize_default_superadmin()
 
@@ -78,7 +99,14 @@ async def lifespan(app: FastAPI):
         print(f"Warning: Failed to start helmet reader: {e}")
 
     yield
+
+    from reports.report_scheduler import stop_report_scheduler
+    await stop_report_scheduler()
+
+    from reports.services.email_service import close_email_service
+    await close_email_service()
     await close_mongodb_connection()
+    _report_log_listener.stop()
 
 
 app = FastAPI(
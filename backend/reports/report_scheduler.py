@@ -1,53 +1,83 @@
 """
 Report Scheduler Integration.
 
-Integrates with the existing APScheduler to run scheduled reports.
+Runs scheduled reports from a background task that sleeps until the
+next schedule is due, and keeps the daily gate entry rollups current.
 """
 
+import asyncio
 from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional
 from bson import ObjectId
+from croniter import croniter
 
 from .schemas import ReportType, ReportFormat, DateRangeType, EmailRecipient
-from .services.pdf_generator import PDFGenerator
+from .services.pdf_generator import get_pdf_generator
 from .services.excel_generator import ExcelGenerator
 from .services.email_service import get_email_service
+from .services.data_aggregator import DataAggregator
+from .templates import (
+    ShiftInchargeTemplate, SafetyOfficerTemplate, ManagerTemplate,
+    AreaSafetyOfficerTemplate, GeneralManagerTemplate, WorkerTemplate
+)
+from .templates.shift_incharge import ShiftHandoverTemplate
+from .templates.safety_officer import ViolationTrendsTemplate, HighRiskWorkersTemplate
+from .templates.manager import MonthlySummaryTemplate, ShiftPerformanceTemplate
+from .templates.area_safety_officer import RiskHeatmapTemplate, CriticalIncidentsTemplate
+from .templates.general_manager import KPIDashboardTemplate, FinancialImpactTemplate
+from .templates.worker import WorkerMonthlyTemplate
+
+
+# Template mapping (built once at import, read-only)
+_TEMPLATE_MAP = MappingProxyType({
+    "shift_summary": ShiftInchargeTemplate,
+    "shift_handover": ShiftHandoverTemplate,
+    "weekly_compliance": SafetyOfficerTemplate,
+    "violation_trends": ViolationTrendsTemplate,
+    "high_risk_workers": HighRiskWorkersTemplate,
+    "daily_operations": ManagerTemplate,
+    "monthly_summary": MonthlySummaryTemplate,
+    "shift_performance": ShiftPerformanceTemplate,
+    "mine_comparison": AreaSafetyOfficerTemplate,
+    "risk_heatmap": RiskHeatmapTemplate,
+    "critical_incidents": CriticalIncidentsTemplate,
+    "executive_summary": GeneralManagerTemplate,
+    "kpi_dashboard": KPIDashboardTemplate,
+    "financial_impact": FinancialImpactTemplate,
+    "compliance_card": WorkerTemplate,
+    "worker_monthly": WorkerMonthlyTemplate,
+})
+
+# Constant offsets used by the date range / next run calculations
+_TD_8H = timedelta(hours=8)
+_TD_1D = timedelta(days=1)
+_TD_1W = timedelta(weeks=1)
+
+# Wake-up bounds for the schedule loop. The floor keeps a schedule that
+# stays due (e.g. its next_run could not be written) from re-running in a
+# tight loop.
+IDLE_SLEEP_SECONDS = 60
+MIN_SLEEP_SECONDS = 30
+MAX_SLEEP_SECONDS = 300
+
+_schedule_task: Optional[asyncio.Task] = None
+
+# Fields read by run_single_schedule; everything else stays on the server
+_DUE_SCHEDULE_PROJECTION = {
+    "name": 1,
+    "report_type": 1,
+    "mine_id": 1,
+    "schedule": 1,
+    "recipients": 1,
+    "config": 1,
+}
 
 
-# Template mapping
 def get_template_for_type(report_type: str, db):
     """Get the appropriate template class for a report type."""
-    from .templates import (
-        ShiftInchargeTemplate, SafetyOfficerTemplate, ManagerTemplate,
-        AreaSafetyOfficerTemplate, GeneralManagerTemplate, WorkerTemplate
-    )
-    from .templates.shift_incharge import ShiftHandoverTemplate
-    from .templates.safety_officer import ViolationTrendsTemplate, HighRiskWorkersTemplate
-    from .templates.manager import MonthlySummaryTemplate, ShiftPerformanceTemplate
-    from .templates.area_safety_officer import RiskHeatmapTemplate, CriticalIncidentsTemplate
-    from .templates.general_manager import KPIDashboardTemplate, FinancialImpactTemplate
-    from .templates.worker import WorkerMonthlyTemplate
-
-    template_map = {
-        "shift_summary": ShiftInchargeTemplate,
-        "shift_handover": ShiftHandoverTemplate,
-        "weekly_compliance": SafetyOfficerTemplate,
-        "violation_trends": ViolationTrendsTemplate,
-        "high_risk_workers": HighRiskWorkersTemplate,
-        "daily_operations": ManagerTemplate,
-        "monthly_summary": MonthlySummaryTemplate,
-        "shift_performance": ShiftPerformanceTemplate,
-        "mine_comparison": AreaSafetyOfficerTemplate,
-        "risk_heatmap": RiskHeatmapTemplate,
-        "critical_incidents": CriticalIncidentsTemplate,
-        "executive_summary": GeneralManagerTemplate,
-        "kpi_dashboard": KPIDashboardTemplate,
-        "financial_impact": FinancialImpactTemplate,
-        "compliance_card": WorkerTemplate,
-        "worker_monthly": WorkerMonthlyTemplate,
-    }
-
-    template_class = template_map.get(report_type)
+    template_class = _TEMPLATE_MAP.get(report_type)
     if template_class:
         return template_class(db)
     return None
@@ -60,15 +90,15 @@ def calculate_date_range(range_type: str) -> tuple:
     if range_type == "previous_shift":
         # Assuming 8-hour shifts
         end_date = now.replace(minute=0, second=0, microsecond=0)
-        start_date = end_date - timedelta(hours=8)
+        start_date = end_date - _TD_8H
 
     elif range_type == "previous_day":
         end_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        start_date = end_date - timedelta(days=1)
+        start_date = end_date - _TD_1D
 
     elif range_type == "previous_week":
         end_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        start_date = end_date - timedelta(weeks=1)
+        start_date = end_date - _TD_1W
 
     elif range_type == "previous_month":
         end_date = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
@@ -81,54 +111,53 @@ def calculate_date_range(range_type: str) -> tuple:
     else:
         # Default to previous day
         end_date = now
-        start_date = now - timedelta(days=1)
+        start_date = now - _TD_1D
 
     return start_date, end_date
 
 
-def calculate_next_run(schedule: dict) -> datetime:
-    """Calculate the next run time for a schedule."""
-    now = datetime.utcnow()
-    freq = schedule.get("frequency", "daily")
-    time_str = schedule.get("time", "06:00")
-
+@lru_cache(maxsize=128)
+def _cron_expression(frequency: str, time_str: str, day_of_week: int, day_of_month: int) -> str:
+    """Translate a schedule's timing fields into a cron expression."""
     time_parts = time_str.split(":")
     hour = int(time_parts[0])
     minute = int(time_parts[1]) if len(time_parts) > 1 else 0
 
-    if freq == "daily":
-        next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        if next_run <= now:
-            next_run += timedelta(days=1)
-
-    elif freq == "weekly":
-        day_of_week = schedule.get("day_of_week", 1)  # 1 = Monday
-        days_ahead = day_of_week - now.isoweekday()
-        if days_ahead < 0:
-            days_ahead += 7
-        next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        next_run += timedelta(days=days_ahead)
-        if next_run <= now:
-            next_run += timedelta(weeks=1)
-
-    elif freq == "monthly":
-        day_of_month = schedule.get("day_of_month", 1)
-        try:
-            next_run = now.replace(day=day_of_month, hour=hour, minute=minute, second=0, microsecond=0)
-        except ValueError:
-            # Handle months with fewer days
-            next_run = now.replace(day=28, hour=hour, minute=minute, second=0, microsecond=0)
+    if frequency == "weekly":
+        # Schedules use ISO weekdays (1 = Monday ... 7 = Sunday); cron uses 0 = Sunday
+        return f"{minute} {hour} * * {day_of_week % 7}"
+    if frequency == "monthly":
+        return f"{minute} {hour} {day_of_month} * *"
+    return f"{minute} {hour} * * *"
 
-        if next_run <= now:
-            if now.month == 12:
-                next_run = next_run.replace(year=now.year + 1, month=1)
-            else:
-                next_run = next_run.replace(month=now.month + 1)
 
-    else:
-        next_run = now + timedelta(days=1)
+def calculate_next_run(schedule: dict) -> datetime:
+    """
+    Calculate the next run time for a schedule.
+
+    Monthly schedules on the 29th-31st skip months without that day, as cron does.
+    """
+    cron = _cron_expression(
+        schedule.get("frequency") or "daily",
+        schedule.get("time") or "06:00",
+        schedule.get("day_of_week") or 1,  # 1 = Monday
+        schedule.get("day_of_month") or 1
+    )
+    return croniter(cron, datetime.utcnow()).get_next(datetime)
+
+
+def _next_run_update(schedule: dict) -> dict:
+    """
+    Fields that move a schedule past its current run.
 
-    return next_run
+    A schedule whose stored timing can't be parsed is deactivated instead,
+    so it doesn't stay due forever.
+    """
+    try:
+        return {"next_run": calculate_next_run(schedule.get("schedule", {}))}
+    except Exception as e:
+        print(f"[{datetime.utcnow()}] Deactivating schedule {schedule.get('name')}: invalid timing ({e})")
+        return {"is_active": False, "last_error": f"Invalid schedule timing: {e}"}
 
 
 async def run_single_schedule(db, schedule: dict):
@@ -143,6 +172,13 @@ async def run_single_schedule(db, schedule: dict):
     report_type = schedule.get("report_type")
     config = schedule.get("config", {})
     recipients_data = schedule.get("recipients", [])
+    formats = config.get("format", ["pdf"])
+
+    # Nothing would be attached or delivered - skip the aggregation entirely
+    if not formats or not recipients_data:
+        print(f"[{datetime.utcnow()}] Skipping {schedule.get('name')}: no formats or recipients")
+        await _update_next_run_only(db, schedule)
+        return
 
     print(f"[{datetime.utcnow()}] Running scheduled report: {schedule.get('name')}")
 
@@ -168,12 +204,11 @@ async def run_single_schedule(db, schedule: dict):
         )
 
         # Generate reports in requested formats
-        formats = config.get("format", ["pdf"])
         attachments = []
 
         for fmt in formats:
             if fmt == "pdf":
-                generator = PDFGenerator()
+                generator = get_pdf_generator()
                 buffer = await generator.generate(template, data, config.get("include_charts", True))
                 attachments.append({
                     "filename": f"{report_type}_{start_date.strftime('%Y%m%d')}.pdf",
@@ -213,15 +248,13 @@ async def run_single_schedule(db, schedule: dict):
             )
 
         # Update schedule
-        next_run = calculate_next_run(schedule.get("schedule", {}))
-
         await db.report_schedules.update_one(
             {"_id": schedule_id},
             {
                 "$set": {
                     "last_run": datetime.utcnow(),
-                    "next_run": next_run,
-                    "last_error": None
+                    "last_error": None,
+                    **_next_run_update(schedule)
                 },
                 "$inc": {"run_count": 1}
             }
@@ -264,67 +297,138 @@ async def run_single_schedule(db, schedule: dict):
             {
                 "$set": {
                     "last_error": str(e),
-                    "next_run": calculate_next_run(schedule.get("schedule", {}))
+                    **_next_run_update(schedule)
                 }
             }
         )
 
 
-def register_report_scheduler(scheduler, db):
+async def _update_next_run_only(db, schedule: dict):
+    """Advance a schedule's next run without recording a run."""
+    await db.report_schedules.update_one(
+        {"_id": schedule["_id"]},
+        {"$set": _next_run_update(schedule)}
+    )
+
+
+async def _dispatch_due(db):
+    """Check for due report schedules and execute them."""
+    now = datetime.utcnow()
+
+    try:
+        # Find schedules that are due
+        due_schedules = await db.report_schedules.find(
+            {"is_active": True, "next_run": {"$lte": now}},
+            _DUE_SCHEDULE_PROJECTION
+        ).to_list(length=50)
+
+        if not due_schedules:
+            return
+
+        print(f"[{now}] Found {len(due_schedules)} due schedules")
+
+        for schedule in due_schedules:
+            try:
+                await run_single_schedule(db, schedule)
+            except Exception as e:
+                print(f"[{now}] Error running schedule {schedule.get('name')}: {e}")
+                import traceback
+                traceback.print_exc()
+
+    except Exception as e:
+        print(f"[{now}] Error checking report schedules: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+async def _report_schedule_loop(db):
     """
-    Register the report scheduler job with APScheduler.
+    Sleep until the earliest active schedule is due, run it, repeat.
 
-    Args:
-        scheduler: APScheduler instance
-        db: MongoDB database instance
+    The sleep is capped so schedules created or edited in the meantime
+    are picked up within MAX_SLEEP_SECONDS, and floored at MIN_SLEEP_SECONDS
+    so a schedule that stays due can't spin the loop.
     """
-    async def check_and_run_schedules():
-        """Check for due report schedules and execute them."""
-        now = datetime.utcnow()
+    while True:
+        try:
+            upcoming = await db.report_schedules.find(
+                {"is_active": True, "next_run": {"$ne": None}},
+                {"next_run": 1}
+            ).sort("next_run", 1).limit(1).to_list(length=1)
+        except Exception as e:
+            print(f"[{datetime.utcnow()}] Error reading next report schedule: {e}")
+            upcoming = []
+
+        if not upcoming:
+            await asyncio.sleep(IDLE_SLEEP_SECONDS)
+            continue
+
+        delay = (upcoming[0]["next_run"] - datetime.utcnow()).total_seconds()
+        await asyncio.sleep(min(max(delay, MIN_SLEEP_SECONDS), MAX_SLEEP_SECONDS))
 
-        print(f"[{now}] Checking for due report schedules...")
+        await _dispatch_due(db)
 
+
+async def stop_report_scheduler():
+    """Cancel the report schedule loop."""
+    global _schedule_task
+
+    if _schedule_task is not None and not _schedule_task.done():
+        _schedule_task.cancel()
         try:
-            # Find schedules that are due
-            due_schedules = await db.report_schedules.find({
-                "is_active": True,
-                "next_run": {"$lte": now}
-            }).to_list(length=50)
-
-            if not due_schedules:
-                print(f"[{now}] No due schedules found")
-                return
-
-            print(f"[{now}] Found {len(due_schedules)} due schedules")
-
-            for schedule in due_schedules:
-                try:
-                    await run_single_schedule(db, schedule)
-                except Exception as e:
-                    print(f"[{now}] Error running schedule {schedule.get('name')}: {e}")
-                    import traceback
-                    traceback.print_exc()
+            await _schedule_task
+        except asyncio.CancelledError:
+            pass
+    _schedule_task = None
 
-        except Exception as e:
-            print(f"[{now}] Error checking report schedules: {e}")
-            import traceback
-            traceback.print_exc()
 
-    # Remove existing job if it exists (for restarts)
+async def _refresh_daily_rollups(db):
+    """Roll up completed days of gate entries for report aggregation."""
+    try:
+        through = await DataAggregator(db).refresh_daily_rollups()
+        if through:
+            print(f"[{datetime.utcnow()}] Daily rollups refreshed through {through.date()}")
+    except Exception as e:
+        print(f"[{datetime.utcnow()}] Error refreshing daily rollups: {e}")
+
+
+def register_report_scheduler(scheduler, db):
+    """
+    Start the report schedule loop.
+
+    Replaces the old 5-minute APScheduler polling job with a task that
+    sleeps until the next schedule is due.
+
+    Args:
+        scheduler: APScheduler instance (used to clear the legacy polling job)
+        db: MongoDB database instance
+    """
+    global _schedule_task
+
+    # Remove the legacy polling job if it exists (for restarts)
     try:
         scheduler.remove_job('check_report_schedules')
     except:
         pass
 
-    # Add job using add_job instead of decorator (works better after scheduler started)
+    if _schedule_task is not None and not _schedule_task.done():
+        _schedule_task.cancel()
+
+    _schedule_task = asyncio.get_running_loop().create_task(_report_schedule_loop(db))
+
+    # Nightly gate entry rollups; the first run (at startup) backfills history
     scheduler.add_job(
-        check_and_run_schedules,
-        'interval',
-        minutes=5,
-        id='check_report_schedules',
-        replace_existing=True
+        _refresh_daily_rollups,
+        'cron',
+        hour=0,
+        minute=15,
+        timezone='UTC',
+        args=[db],
+        id='daily_report_rollups',
+        replace_existing=True,
+        next_run_time=datetime.now()
     )
 
     print("Report scheduler registered successfully")
-    print("  - Checking for due schedules every 5 minutes")
-    print("  - Next check in 5 minutes")
+    print("  - Sleeping until the next due schedule (max 5 minutes between checks)")
+    print("  - Rolling up gate entries daily at 00:15 UTC")
@@ -8,11 +8,19 @@ Provides endpoints for:
 - Downloading generated reports
 """
 
-from datetime import datetime, timedelta
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+from functools import lru_cache
+from datetime import datetime, time, timedelta
 from typing import Optional, List
 from io import BytesIO
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from bson import ObjectId
 import uuid
 
@@ -22,6 +30,7 @@ from auth import (
     get_shift_incharge_or_above,
     get_safety_officer_or_above,
     get_manager_or_above,
+    get_super_admin,
     check_mine_access,
     UserRole
 )
@@ -30,12 +39,15 @@ from .schemas import (
     ReportType, ReportFormat, ReportTypeInfo, ReportTypesResponse,
     GenerateReportRequest, GenerateReportResponse,
     ReportScheduleCreate, ReportScheduleUpdate, ReportScheduleResponse,
-    ROLE_REPORT_TYPES, REPORT_TYPE_INFO,
-    ScheduleFrequency, EmailRecipient
+    ROLE_REPORT_TYPES, ROLE_REPORT_TYPE_SETS, REPORT_TYPE_INFO,
+    EmailRecipient
 )
-from .services.pdf_generator import PDFGenerator
+from .services.pdf_generator import get_pdf_generator
 from .services.excel_generator import ExcelGenerator
 from .services.email_service import get_email_service
+from .services.report_cache import get_report_cache
+from .services.data_aggregator import DataAggregator
+from .report_scheduler import calculate_next_run
 from .templates import (
     ShiftInchargeTemplate, SafetyOfficerTemplate, ManagerTemplate,
     AreaSafetyOfficerTemplate, GeneralManagerTemplate, WorkerTemplate,
@@ -49,11 +61,49 @@ from .templates.general_manager import KPIDashboardTemplate, FinancialImpactTemp
 from .templates.worker import WorkerMonthlyTemplate
 
 
-router = APIRouter(prefix="/reports", tags=["Reports"])
+# JSON bodies are encoded with orjson (datetimes and enums handled in C)
+router = APIRouter(prefix="/reports", tags=["Reports"], default_response_class=ORJSONResponse)
 
-# In-memory cache for generated reports (in production, use Redis or file storage)
-_report_cache = {}
+# Chunk size for streamed report downloads
+STREAM_CHUNK_SIZE = 64 * 1024
 
+# Generated reports are immutable, but only for the user who requested them
+DOWNLOAD_CACHE_CONTROL = "private, max-age=3600, immutable"
+
+# (content type, file extension) per output format
+FORMAT_OUTPUT = {
+    ReportFormat.PDF: ("application/pdf", "pdf"),
+    ReportFormat.EXCEL: ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    ReportFormat.CSV: ("text/csv", "csv"),
+}
+
+# Request dates are plain YYYY-MM-DD
+_YMD_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Queued report generation jobs and the limit on how many run at once
+_report_jobs = set()
+_generation_slots = asyncio.Semaphore(int(os.getenv("REPORT_MAX_CONCURRENT_JOBS", "2")))
+
+# Renders in progress, keyed by _render_key, shared by identical requests
+_inflight_renders = {}
+
+# Response shape for schedule listings, built server-side by MongoDB
+_SCHEDULE_LIST_PROJECTION = {
+    "_id": 0,
+    "id": {"$toString": "$_id"},
+    "name": {"$ifNull": ["$name", None]},
+    "report_type": {"$ifNull": ["$report_type", None]},
+    "role_target": {"$ifNull": ["$role_target", None]},
+    "mine_id": {"$toString": "$mine_id"},
+    "schedule": {"$ifNull": ["$schedule", None]},
+    "recipients": {"$ifNull": ["$recipients", []]},
+    "config": {"$ifNull": ["$config", {}]},
+    "is_active": {"$ifNull": ["$is_active", True]},
+    "next_run": {"$ifNull": ["$next_run", None]},
+    "last_run": {"$ifNull": ["$last_run", None]},
+    "run_count": {"$ifNull": ["$run_count", 0]},
+    "created_at": {"$ifNull": ["$created_at", None]},
+}
 
 # Template registry
 TEMPLATE_REGISTRY = {
@@ -76,56 +126,73 @@ TEMPLATE_REGISTRY = {
 }
 
 
-# ==================== Report Types ====================
+@lru_cache(maxsize=32)
+def _excel_structure_for(report_type: ReportType) -> list:
+    """Get the (static) export structure for a report type, computed once."""
+    return TEMPLATE_REGISTRY[report_type](None).get_excel_structure()
 
-@router.get("/types", response_model=ReportTypesResponse)
-async def get_report_types(
-    current_user: dict = Depends(get_current_user)
-):
-    """
-    Get available report types for the current user's role.
-    """
-    user_role = current_user.get("role", "worker")
-
-    # Get report types for this role
-    available_types = ROLE_REPORT_TYPES.get(user_role, [])
 
-    # Build response
+def _build_report_types_response(role: str) -> ReportTypesResponse:
+    """Build the (static) list of report types available to a role."""
     report_types = []
-    for report_type in available_types:
+    for report_type in ROLE_REPORT_TYPES[role]:
         info = REPORT_TYPE_INFO.get(report_type, {})
         report_types.append(ReportTypeInfo(
             id=report_type,
             name=info.get("name", report_type.value),
             description=info.get("description", ""),
             available_formats=[ReportFormat.PDF, ReportFormat.EXCEL, ReportFormat.CSV],
-            min_role=user_role,
-            parameters=info.get("parameters", [])
+            min_role=role,
+            parameters=list(info.get("parameters", ()))
         ))
 
     return ReportTypesResponse(report_types=report_types)
 
 
+# Report type listings per role, built and serialized once at import
+_ROLE_REPORT_TYPES_JSON = {
+    role: _build_report_types_response(role).model_dump_json().encode("utf-8")
+    for role in ROLE_REPORT_TYPES
+}
+_NO_REPORT_TYPES_JSON = ReportTypesResponse(report_types=[]).model_dump_json().encode("utf-8")
+
+
+# ==================== Report Types ====================
+
+@router.get("/types", response_model=ReportTypesResponse)
+async def get_report_types(
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get available report types for the current user's role.
+    """
+    user_role = current_user.get("role", "worker")
+
+    return Response(
+        content=_ROLE_REPORT_TYPES_JSON.get(user_role, _NO_REPORT_TYPES_JSON),
+        media_type="application/json"
+    )
+
+
 # ==================== Report Generation ====================
 
-@router.post("/generate", response_model=GenerateReportResponse)
+@router.post("/generate", response_model=GenerateReportResponse, status_code=202)
 async def generate_report(
     request: GenerateReportRequest,
-    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Generate a report on-demand.
+    Queue an on-demand report.
 
-    Returns a report ID for download or sends via email.
+    Returns a report ID immediately; poll /reports/status/{report_id}
+    and download once it is ready (or wait for the email).
     """
     db = get_database()
 
     # Verify user has access to this report type
     user_role = current_user.get("role", "worker")
-    available_types = ROLE_REPORT_TYPES.get(user_role, [])
 
-    if request.report_type not in available_types:
+    if request.report_type not in ROLE_REPORT_TYPE_SETS.get(user_role, frozenset()):
         raise HTTPException(
             status_code=403,
             detail="You don't have access to this report type"
@@ -148,118 +215,226 @@ async def generate_report(
 
     template = template_class(db)
 
-    # Parse dates
-    try:
-        start_date = datetime.strptime(request.start_date, "%Y-%m-%d")
-        end_date = datetime.strptime(request.end_date, "%Y-%m-%d") + timedelta(days=1)
-    except ValueError:
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid date format. Use YYYY-MM-DD"
-        )
-
-    # Aggregate data - ensure filters is always a dict
-    filters = request.filters if isinstance(request.filters, dict) else {}
-    data = await template.aggregate_data(
-        start_date=start_date,
-        end_date=end_date,
-        mine_id=request.mine_id,
-        filters=filters
-    )
+    # Report window runs to the end of end_date
+    start_date = datetime.combine(request.start_date, time.min)
+    end_date = datetime.combine(request.end_date, time.min) + timedelta(days=1)
 
-    # Generate report
     report_id = str(uuid.uuid4())
-
-    if request.format == ReportFormat.PDF:
-        generator = PDFGenerator()
-        buffer = await generator.generate(template, data)
-        content_type = "application/pdf"
-        extension = "pdf"
-    elif request.format == ReportFormat.EXCEL:
-        generator = ExcelGenerator()
-        buffer = await generator.generate(template, data)
-        content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        extension = "xlsx"
-    else:  # CSV
-        # Generate CSV from data
-        buffer = _generate_csv(template, data)
-        content_type = "text/csv"
-        extension = "csv"
-
-    # Store in cache
+    content_type, extension = FORMAT_OUTPUT[request.format]
     filename = f"{request.report_type.value}_{request.start_date}_to_{request.end_date}.{extension}"
-    _report_cache[report_id] = {
-        "buffer": buffer,
-        "filename": filename,
-        "content_type": content_type,
-        "created_at": datetime.utcnow(),
-        "format": extension
-    }
 
-    # Handle delivery
-    if request.delivery == "email" and request.recipients:
-        background_tasks.add_task(
-            _send_report_email,
-            recipients=request.recipients,
-            report_name=template.report_name,
-            date_range=data.get("date_range", ""),
-            buffer=buffer,
-            filename=filename,
-            content_type=content_type,
-            summary_metrics=template.get_summary_metrics(data)
-        )
+    await get_report_cache().set_status(report_id, "pending", filename=filename)
 
-        return GenerateReportResponse(
-            success=True,
-            report_id=report_id,
-            file_name=filename,
-            format=request.format,
-            generated_at=datetime.utcnow().isoformat(),
-            message="Report generated and email scheduled"
-        )
+    # Run generation outside the request; keep a reference so the task isn't collected
+    task = asyncio.create_task(_generate_report_job(
+        report_id, template, request, start_date, end_date, filename
+    ))
+    _report_jobs.add(task)
+    task.add_done_callback(_report_jobs.discard)
 
-    return GenerateReportResponse(
+    emailed = request.delivery == "email" and request.recipients
+
+    # Fields are built here, so skip re-validating them before serialization
+    return GenerateReportResponse.model_construct(
         success=True,
         report_id=report_id,
-        download_url=f"/reports/download/{report_id}",
+        status="pending",
+        download_url=None if emailed else f"/reports/download/{report_id}",
         file_name=filename,
         format=request.format,
         generated_at=datetime.utcnow().isoformat(),
-        message="Report generated successfully"
+        message="Report queued for generation and email" if emailed else "Report queued for generation"
     )
 
 
+@router.get("/status/{report_id}")
+async def get_report_status(
+    report_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get the generation status of a queued report.
+    """
+    meta = await get_report_cache().get_meta(report_id)
+    if meta is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Report not found or expired"
+        )
+
+    status = meta.get("status", "ready")
+
+    return {
+        "report_id": report_id,
+        "status": status,
+        "file_name": meta.get("filename"),
+        "download_url": f"/reports/download/{report_id}" if status == "ready" else None,
+        "error": meta.get("error")
+    }
+
+
 @router.get("/download/{report_id}")
 async def download_report(
     report_id: str,
+    request: Request,
     current_user: dict = Depends(get_current_user)
 ):
     """
     Download a generated report by ID.
+
+    Reports never change once generated, so the report ID doubles as the
+    ETag and a matching If-None-Match gets a 304 without touching the cache.
     """
-    if report_id not in _report_cache:
+    etag = f'"{report_id}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": DOWNLOAD_CACHE_CONTROL})
+
+    cache = get_report_cache()
+    report = await cache.get(report_id)
+    if report is None:
+        meta = await cache.get_meta(report_id)
+        if meta and meta.get("status") == "pending":
+            raise HTTPException(
+                status_code=409,
+                detail="Report is still being generated"
+            )
         raise HTTPException(
             status_code=404,
             detail="Report not found or expired"
         )
 
-    report = _report_cache[report_id]
-    buffer = report["buffer"]
+    return StreamingResponse(
+        _iter_bytes(report["data"]),
+        media_type=report["content_type"],
+        headers={
+            "Content-Disposition": f"attachment; filename={report['filename']}",
+            "ETag": etag,
+            "Cache-Control": DOWNLOAD_CACHE_CONTROL
+        }
+    )
 
-    # Reset buffer position
-    buffer.seek(0)
+
+@router.get("/cache/stats")
+async def get_report_cache_stats(
+    current_user: dict = Depends(get_super_admin)
+):
+    """
+    Get generated-report cache metrics (entries and stored bytes).
+    """
+    return await get_report_cache().stats()
+
+
+@router.post("/rollups/rebuild")
+async def rebuild_report_rollups(
+    current_user: dict = Depends(get_super_admin)
+):
+    """
+    Discard the daily gate entry rollups and rebuild them.
+
+    Run after importing or purging historical gate entries.
+    """
+    through = await DataAggregator(get_database()).reset_daily_rollups()
+    return {"message": "Daily rollups rebuilt", "through": through}
+
+
+@router.get("/export/csv")
+async def export_csv(
+    report_type: ReportType = Query(..., description="Report type to export"),
+    start_date: str = Query(..., description="Start date in YYYY-MM-DD format"),
+    end_date: str = Query(..., description="End date in YYYY-MM-DD format"),
+    mine_id: Optional[str] = Query(None),
+    gate_id: Optional[str] = Query(None),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream a report's main table as CSV straight from the database.
+
+    Rows are read from a cursor in batches and written out as they arrive,
+    so memory use does not grow with the size of the date range.
+    """
+    db = get_database()
+
+    user_role = current_user.get("role", "worker")
+    if report_type not in ROLE_REPORT_TYPE_SETS.get(user_role, frozenset()):
+        raise HTTPException(
+            status_code=403,
+            detail="You don't have access to this report type"
+        )
+
+    # Only super admins and general managers may export across all mines
+    if not mine_id and user_role not in (UserRole.SUPER_ADMIN.value, UserRole.GENERAL_MANAGER.value):
+        mine_id = current_user.get("mine_id")
+        if not mine_id:
+            raise HTTPException(
+                status_code=400,
+                detail="mine_id is required"
+            )
+
+    if mine_id and not check_mine_access(current_user, mine_id):
+        raise HTTPException(
+            status_code=403,
+            detail="You don't have access to this mine"
+        )
+
+    start = _parse_ymd(start_date)
+    end = _parse_ymd(end_date)
+    if end < start:
+        raise HTTPException(
+            status_code=400,
+            detail="end_date must not be before start_date"
+        )
+
+    template_class = TEMPLATE_REGISTRY.get(report_type)
+    if not template_class:
+        raise HTTPException(
+            status_code=400,
+            detail=f"No template found for report type: {report_type}"
+        )
+
+    export = template_class(db).aggregate_data_cursor(
+        start_date=start,
+        end_date=end + timedelta(days=1),
+        mine_id=mine_id,
+        filters={"gate_id": gate_id}
+    )
+    if export is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Streaming CSV export is not supported for report type: {report_type}"
+        )
+
+    columns, rows = export
+    filename = f"{report_type.value}_{start_date}_to_{end_date}.csv"
 
     return StreamingResponse(
-        buffer,
-        media_type=report["content_type"],
+        _csv_stream(columns, rows),
+        media_type="text/csv",
         headers={
-            "Content-Disposition": f"attachment; filename={report['filename']}"
+            "Content-Disposition": f"attachment; filename={filename}"
         }
     )
 
 
 # ==================== Report Schedules ====================
 
+def _user_object_id(current_user: dict) -> ObjectId:
+    """Get the caller's user id as an ObjectId; schedule ownership needs a real user."""
+    user_id = current_user.get("user_id")
+    if not ObjectId.is_valid(user_id):
+        raise HTTPException(
+            status_code=401,
+            detail="Token does not identify a user"
+        )
+    return ObjectId(user_id)
+
+
+def _mine_object_ids(current_user: dict) -> List[ObjectId]:
+    """Get the caller's mine ids as ObjectIds, skipping invalid ones."""
+    mine_ids = current_user.get("mine_ids") or ([current_user["mine_id"]] if current_user.get("mine_id") else [])
+    return [ObjectId(m) for m in mine_ids if ObjectId.is_valid(m)]
+
+
 @router.get("/schedules")
 async def list_schedules(
     current_user: dict = Depends(get_shift_incharge_or_above)
@@ -268,7 +443,6 @@ async def list_schedules(
     List all report schedules accessible to the current user.
     """
     db = get_database()
-    user_id = current_user.get("user_id")
     user_role = UserRole(current_user.get("role"))
 
     # Build query based on role
@@ -278,23 +452,21 @@ async def list_schedules(
         query = {}  # Can see all
     else:
         # Can only see their own schedules or schedules for their mine
-        mine_id = current_user.get("mine_id")
-        mine_ids = current_user.get("mine_ids", [])
-
         query = {
             "$or": [
-                {"created_by": ObjectId(user_id)},
-                {"mine_id": {"$in": [ObjectId(m) for m in mine_ids] if mine_ids else [ObjectId(mine_id)] if mine_id else []}}
+                {"created_by": _user_object_id(current_user)},
+                {"mine_id": {"$in": _mine_object_ids(current_user)}}
             ]
         }
 
-    schedules = await db.report_schedules.find(query).sort("created_at", -1).to_list(length=100)
+    schedules = await db.report_schedules.aggregate([
+        {"$match": query},
+        {"$sort": {"created_at": -1}},
+        {"$limit": 100},
+        {"$project": _SCHEDULE_LIST_PROJECTION}
+    ]).to_list(length=100)
 
-    return {
-        "schedules": [
-            _format_schedule(s) for s in schedules
-        ]
-    }
+    return {"schedules": schedules}
 
 
 @router.post("/schedules")
@@ -306,12 +478,10 @@ async def create_schedule(
     Create a new report schedule.
     """
     db = get_database()
-    user_id = current_user.get("user_id")
     user_role = current_user.get("role")
 
     # Verify user has access to this report type
-    available_types = ROLE_REPORT_TYPES.get(user_role, [])
-    if schedule.report_type not in available_types:
+    if schedule.report_type not in ROLE_REPORT_TYPE_SETS.get(user_role, frozenset()):
         raise HTTPException(
             status_code=403,
             detail="You don't have access to this report type"
@@ -332,7 +502,7 @@ async def create_schedule(
         "name": schedule.name,
         "report_type": schedule.report_type.value,
         "role_target": user_role,
-        "created_by": ObjectId(user_id),
+        "created_by": _user_object_id(current_user),
         "mine_id": ObjectId(schedule.mine_id) if schedule.mine_id else None,
         "schedule": {
             "frequency": schedule.schedule.frequency.value,
@@ -340,8 +510,8 @@ async def create_schedule(
             "day_of_week": schedule.schedule.day_of_week,
             "day_of_month": schedule.schedule.day_of_month
         },
-        "recipients": [r.dict() for r in schedule.recipients],
-        "config": schedule.config.dict(),
+        "recipients": [r.model_dump() for r in schedule.recipients],
+        "config": schedule.config.model_dump(),
         "is_active": True,
         "next_run": next_run,
         "last_run": None,
@@ -392,9 +562,9 @@ async def update_schedule(
     if updates.name is not None:
         update_doc["name"] = updates.name
     if updates.recipients is not None:
-        update_doc["recipients"] = [r.dict() for r in updates.recipients]
+        update_doc["recipients"] = [r.model_dump() for r in updates.recipients]
     if updates.config is not None:
-        update_doc["config"] = updates.config.dict()
+        update_doc["config"] = updates.config.model_dump()
     if updates.is_active is not None:
         update_doc["is_active"] = updates.is_active
     if updates.schedule is not None:
@@ -487,7 +657,7 @@ async def get_shift_incharge_summary(
 
     template = ShiftInchargeTemplate(db)
 
-    date_obj = datetime.strptime(date, "%Y-%m-%d") if date else datetime.utcnow()
+    date_obj = _parse_ymd(date) if date else datetime.utcnow()
 
     data = await template.aggregate_data(
         start_date=date_obj,
@@ -513,8 +683,8 @@ async def get_safety_officer_compliance(
     template = SafetyOfficerTemplate(db)
 
     data = await template.aggregate_data(
-        start_date=datetime.strptime(start_date, "%Y-%m-%d"),
-        end_date=datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1),
+        start_date=_parse_ymd(start_date),
+        end_date=_parse_ymd(end_date) + timedelta(days=1),
         mine_id=mine_id,
         filters={"group_by": group_by}
     )
@@ -535,8 +705,8 @@ async def get_manager_operations(
     template = ManagerTemplate(db)
 
     data = await template.aggregate_data(
-        start_date=datetime.strptime(start_date, "%Y-%m-%d"),
-        end_date=datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1),
+        start_date=_parse_ymd(start_date),
+        end_date=_parse_ymd(end_date) + timedelta(days=1),
         mine_id=mine_id
     )
 
@@ -592,14 +762,14 @@ async def generate_emergency_incident_report(
     template = EmergencyIncidentTemplate(db=None)
 
     # Generate PDF
-    generator = PDFGenerator()
+    generator = get_pdf_generator()
     buffer = await generator.generate(template, data)
 
     # Return as downloadable PDF
     filename = "Emergency_Incident_Report_Dec_12_2024.pdf"
 
     return StreamingResponse(
-        buffer,
+        _iter_bytes(buffer.getbuffer()),
         media_type="application/pdf",
         headers={
             "Content-Disposition": f"attachment; filename={filename}"
@@ -630,7 +800,7 @@ async def generate_emergency_incident_report_post(
     template = EmergencyIncidentTemplate(db=None)
 
     # Generate PDF
-    generator = PDFGenerator()
+    generator = get_pdf_generator()
     buffer = await generator.generate(template, data)
 
     # Generate report ID for caching
@@ -638,13 +808,13 @@ async def generate_emergency_incident_report_post(
     filename = f"Emergency_Incident_Report_{incident_date.replace('-', '_')}.pdf"
 
     # Store in cache
-    _report_cache[report_id] = {
-        "buffer": buffer,
-        "filename": filename,
-        "content_type": "application/pdf",
-        "created_at": datetime.utcnow(),
-        "format": "pdf"
-    }
+    await get_report_cache().set(
+        report_id,
+        buffer.getvalue(),
+        filename=filename,
+        content_type="application/pdf",
+        format="pdf"
+    )
 
     return GenerateReportResponse(
         success=True,
@@ -659,73 +829,32 @@ async def generate_emergency_incident_report_post(
 
 # ==================== Helper Functions ====================
 
-def _format_schedule(schedule: dict) -> dict:
-    """Format a schedule document for response."""
-    return {
-        "id": str(schedule["_id"]),
-        "name": schedule.get("name"),
-        "report_type": schedule.get("report_type"),
-        "role_target": schedule.get("role_target"),
-        "mine_id": str(schedule["mine_id"]) if schedule.get("mine_id") else None,
-        "schedule": schedule.get("schedule"),
-        "recipients": schedule.get("recipients", []),
-        "config": schedule.get("config", {}),
-        "is_active": schedule.get("is_active", True),
-        "next_run": schedule.get("next_run"),
-        "last_run": schedule.get("last_run"),
-        "run_count": schedule.get("run_count", 0),
-        "created_at": schedule.get("created_at")
-    }
+def _parse_ymd(value: str) -> datetime:
+    """Parse a YYYY-MM-DD date string, raising a 400 if it is malformed."""
+    if value and _YMD_RE.fullmatch(value):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+
+    raise HTTPException(
+        status_code=400,
+        detail="Invalid date format. Use YYYY-MM-DD"
+    )
 
 
 def _calculate_next_run(schedule_config) -> datetime:
     """Calculate the next run time for a schedule."""
-    now = datetime.utcnow()
-    time_parts = schedule_config.time.split(":")
-    hour = int(time_parts[0])
-    minute = int(time_parts[1]) if len(time_parts) > 1 else 0
-
-    if schedule_config.frequency == ScheduleFrequency.DAILY:
-        next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        if next_run <= now:
-            next_run += timedelta(days=1)
-
-    elif schedule_config.frequency == ScheduleFrequency.WEEKLY:
-        day_of_week = schedule_config.day_of_week or 1  # Default to Monday
-        days_ahead = day_of_week - now.isoweekday()
-        if days_ahead < 0:
-            days_ahead += 7
-        next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0) + timedelta(days=days_ahead)
-        if next_run <= now:
-            next_run += timedelta(weeks=1)
-
-    elif schedule_config.frequency == ScheduleFrequency.MONTHLY:
-        day_of_month = schedule_config.day_of_month or 1
-        next_run = now.replace(day=day_of_month, hour=hour, minute=minute, second=0, microsecond=0)
-        if next_run <= now:
-            # Move to next month
-            if now.month == 12:
-                next_run = next_run.replace(year=now.year + 1, month=1)
-            else:
-                next_run = next_run.replace(month=now.month + 1)
-
-    else:
-        next_run = now + timedelta(days=1)
+    return calculate_next_run(schedule_config.model_dump())
 
-    return next_run
 
-
-def _generate_csv(template, data: dict) -> BytesIO:
-    """Generate a simple CSV from report data."""
-    from io import StringIO
-    import csv
-
-    output = StringIO()
+def _generate_csv(structure: list, data: dict) -> BytesIO:
+    """Generate a simple CSV from report data and the template's export structure."""
+    # Encode straight into the byte buffer instead of building a str first
+    buffer = BytesIO()
+    output = io.TextIOWrapper(buffer, encoding="utf-8", newline="", write_through=True)
     writer = csv.writer(output)
 
-    # Get structure
-    structure = template.get_excel_structure()
-
     for sheet in structure:
         if sheet.get("type") == "data_table":
             data_key = sheet.get("data_key")
@@ -733,28 +862,219 @@ def _generate_csv(template, data: dict) -> BytesIO:
             table_data = _get_nested_value(data, data_key)
 
             if table_data and isinstance(table_data, list):
+                # Per-column metadata, computed once per table
+                header = [c.get("label", c.get("key")) for c in columns]
+                getters = [_make_getter(c.get("key")) for c in columns]
+
                 # Write headers
-                writer.writerow([c.get("label", c.get("key")) for c in columns])
+                writer.writerow(header)
 
                 # Write data
-                for row in table_data:
-                    row_values = []
-                    for col in columns:
-                        value = _get_nested_value(row, col.get("key"))
-                        if isinstance(value, list):
-                            value = ", ".join(str(v) for v in value)
-                        row_values.append(value if value is not None else "")
-                    writer.writerow(row_values)
+                writer.writerows([g(row) for g in getters] for row in table_data)
 
                 writer.writerow([])  # Empty row between tables
 
-    # Convert to bytes
-    buffer = BytesIO()
-    buffer.write(output.getvalue().encode('utf-8'))
+    output.flush()
+    output.detach()
     buffer.seek(0)
     return buffer
 
 
+def _render_key(request: GenerateReportRequest) -> str:
+    """Key identifying requests that would render byte-identical reports."""
+    parts = [
+        request.report_type.value,
+        request.format.value,
+        request.mine_id,
+        request.start_date,
+        request.end_date,
+        request.filters if isinstance(request.filters, dict) else {}
+    ]
+    encoded = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+async def _render_report(
+    template,
+    request: GenerateReportRequest,
+    start_date: datetime,
+    end_date: datetime
+):
+    """Aggregate and render a report, returning (data, buffer)."""
+    # Aggregate data - ensure filters is always a dict
+    filters = request.filters if isinstance(request.filters, dict) else {}
+    data = await template.aggregate_data(
+        start_date=start_date,
+        end_date=end_date,
+        mine_id=request.mine_id,
+        filters=filters
+    )
+
+    if request.format == ReportFormat.PDF:
+        buffer = await get_pdf_generator().generate(template, data)
+    elif request.format == ReportFormat.EXCEL:
+        buffer = await ExcelGenerator().generate(
+            template, data, structure=_excel_structure_for(request.report_type)
+        )
+    else:  # CSV
+        buffer = _generate_csv(_excel_structure_for(request.report_type), data)
+
+    return data, buffer
+
+
+async def _render_report_once(
+    template,
+    request: GenerateReportRequest,
+    start_date: datetime,
+    end_date: datetime
+):
+    """
+    Render a report, sharing the work with identical in-flight requests.
+
+    The first caller for a key renders (within a generation slot); callers
+    arriving before it finishes await the same result instead of
+    repeating the aggregation. If that render is cancelled, its waiters
+    retry rather than failing with it.
+    """
+    key = _render_key(request)
+    while (future := _inflight_renders.get(key)) is not None:
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Only the shared render was cancelled, not this caller
+            if not future.cancelled():
+                raise
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight_renders[key] = future
+    try:
+        async with _generation_slots:
+            result = await _render_report(template, request, start_date, end_date)
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved in case nobody else is waiting
+        raise
+    finally:
+        _inflight_renders.pop(key, None)
+
+
+async def _generate_report_job(
+    report_id: str,
+    template,
+    request: GenerateReportRequest,
+    start_date: datetime,
+    end_date: datetime,
+    filename: str
+):
+    """Aggregate, render and store a queued report, then deliver it."""
+    cache = get_report_cache()
+    content_type, extension = FORMAT_OUTPUT[request.format]
+
+    try:
+        data, buffer = await _render_report_once(template, request, start_date, end_date)
+
+        await cache.set(
+            report_id,
+            buffer.getvalue(),
+            filename=filename,
+            content_type=content_type,
+            format=extension
+        )
+
+        date_range = data.get("date_range", "")
+        summary_metrics = template.get_summary_metrics(data)
+
+    except asyncio.CancelledError:
+        # Don't leave the report pending for clients polling its status
+        await cache.set_status(report_id, "failed", filename=filename, error="Report generation was cancelled")
+        raise
+    except Exception as e:
+        print(f"[{datetime.utcnow()}] Error generating report {report_id}: {e}")
+        await cache.set_status(report_id, "failed", filename=filename, error=e)
+        return
+
+    # The cache holds the report now; don't keep it alive through the SMTP send
+    del data, buffer
+
+    # Handle delivery
+    if request.delivery == "email" and request.recipients:
+        await _send_report_email(
+            recipients=request.recipients,
+            report_name=template.report_name,
+            date_range=date_range,
+            report_id=report_id,
+            filename=filename,
+            content_type=content_type,
+            summary_metrics=summary_metrics
+        )
+
+
+async def _iter_bytes(data, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Yield report contents in fixed-size chunks.
+
+    Must stay an async generator: StreamingResponse runs sync iterators
+    in the threadpool, one hop per chunk.
+    """
+    view = memoryview(data)
+    for i in range(0, len(view), chunk_size):
+        yield bytes(view[i:i + chunk_size])
+
+
+async def _csv_stream(columns: list, rows, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Yield CSV bytes for the rows of an async row iterator.
+
+    Must stay an async generator so the rows are iterated on the event
+    loop; output is flushed whenever roughly chunk_size characters are buffered.
+    """
+    text = io.StringIO()
+    writer = csv.writer(text)
+    getters = [_make_getter(c.get("key")) for c in columns]
+
+    writer.writerow([c.get("label", c.get("key")) for c in columns])
+
+    async for row in rows:
+        writer.writerow([g(row) for g in getters])
+        if text.tell() >= chunk_size:
+            yield text.getvalue().encode("utf-8")
+            text.seek(0)
+            text.truncate()
+
+    if text.tell():
+        yield text.getvalue().encode("utf-8")
+
+
+def _make_getter(key: str):
+    """
+    Build a CSV cell getter for a dotted column key.
+
+    The key is split once per column rather than once per cell. Lists are
+    joined with ", " and missing values become "".
+    """
+    parts = key.split(".") if key else []
+
+    def getter(row):
+        value = row if parts else None
+        for part in parts:
+            if not isinstance(value, dict):
+                return ""
+            value = value.get(part)
+
+        if value is None:
+            return ""
+        if isinstance(value, list):
+            return ", ".join(str(v) for v in value)
+        return value
+
+    return getter
+
+
 def _get_nested_value(data: dict, key: str):
     """Get nested value from dict using dot notation."""
     if not key or not data:
@@ -776,12 +1096,17 @@ async def _send_report_email(
     recipients: List[EmailRecipient],
     report_name: str,
     date_range: str,
-    buffer: BytesIO,
+    report_id: str,
     filename: str,
     content_type: str,
     summary_metrics: list
 ):
-    """Send report email in background."""
+    """Send a cached report by email in background."""
+    data = await get_report_cache().get_bytes(report_id)
+    if data is None:
+        print(f"[{datetime.utcnow()}] Report {report_id} expired before it could be emailed")
+        return
+
     email_service = get_email_service()
 
     await email_service.send_report(
@@ -790,7 +1115,7 @@ async def _send_report_email(
         date_range=date_range,
         attachments=[{
             "filename": filename,
-            "data": buffer,
+            "data": data,
             "content_type": content_type,
             "format": filename.split(".")[-1]
         }],
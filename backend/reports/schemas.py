@@ -2,10 +2,26 @@
 Pydantic schemas for report generation.
 """
 
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import re
+from datetime import datetime, date
+from typing import Optional, List, Dict, Any, Annotated
 from enum import Enum
-from pydantic import BaseModel, EmailStr, Field
+from types import MappingProxyType
+from pydantic import BaseModel, ConfigDict, Field, AfterValidator, model_validator
+
+
+# Syntactic email check: one "@", no whitespace, a dot in the domain
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+
+def _check_email(value: str) -> str:
+    """Validate an email address with the precompiled pattern."""
+    if not _EMAIL_RE.fullmatch(value):
+        raise ValueError("value is not a valid email address")
+    return value
+
+
+Email = Annotated[str, AfterValidator(_check_email)]
 
 
 class ReportType(str, Enum):
@@ -71,25 +87,29 @@ class DateRangeType(str, Enum):
 
 class EmailRecipient(BaseModel):
     """Email recipient model."""
-    email: EmailStr
+    model_config = ConfigDict(frozen=True)
+
+    email: Email
     name: str
     type: str = "to"  # to, cc, bcc
 
 
 class ReportScheduleConfig(BaseModel):
     """Configuration for scheduled reports."""
-    format: List[ReportFormat] = [ReportFormat.PDF]
+    format: List[ReportFormat] = Field(default_factory=lambda: [ReportFormat.PDF])
     date_range: DateRangeType = DateRangeType.PREVIOUS_DAY
     include_charts: bool = True
-    filters: Dict[str, Any] = {}
+    filters: Dict[str, Any] = Field(default_factory=dict)
 
 
 class ScheduleConfig(BaseModel):
     """Schedule timing configuration."""
+    model_config = ConfigDict(frozen=True)
+
     frequency: ScheduleFrequency
-    time: str = "06:00"  # HH:MM format UTC
-    day_of_week: Optional[int] = None  # 1-7 for weekly
-    day_of_month: Optional[int] = None  # 1-31 for monthly
+    time: Annotated[str, Field(pattern=r"^([01]\d|2[0-3]):[0-5]\d$")] = "06:00"  # HH:MM format UTC
+    day_of_week: Annotated[Optional[int], Field(ge=1, le=7)] = None  # 1-7 for weekly
+    day_of_month: Annotated[Optional[int], Field(ge=1, le=31)] = None  # 1-31 for monthly
 
 
 class ReportScheduleCreate(BaseModel):
@@ -99,7 +119,7 @@ class ReportScheduleCreate(BaseModel):
     mine_id: Optional[str] = None
     schedule: ScheduleConfig
     recipients: List[EmailRecipient]
-    config: ReportScheduleConfig = ReportScheduleConfig()
+    config: ReportScheduleConfig = Field(default_factory=ReportScheduleConfig)
 
 
 class ReportScheduleUpdate(BaseModel):
@@ -133,18 +153,26 @@ class GenerateReportRequest(BaseModel):
     """Request model for on-demand report generation."""
     report_type: ReportType
     format: ReportFormat = ReportFormat.PDF
-    start_date: str  # YYYY-MM-DD
-    end_date: str  # YYYY-MM-DD
+    start_date: date  # YYYY-MM-DD
+    end_date: date  # YYYY-MM-DD
     mine_id: Optional[str] = None
-    filters: Dict[str, Any] = {}
+    filters: Dict[str, Any] = Field(default_factory=dict)
     delivery: str = "download"  # download or email
     recipients: Optional[List[EmailRecipient]] = None
 
+    @model_validator(mode="after")
+    def check_date_order(self):
+        """Reject ranges that end before they start."""
+        if self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
 
 class GenerateReportResponse(BaseModel):
     """Response model for report generation."""
     success: bool
     report_id: str
+    status: Optional[str] = None  # pending, ready, failed
     download_url: Optional[str] = None
     file_name: Optional[str] = None
     format: Optional[ReportFormat] = None
@@ -233,22 +261,22 @@ class WorkerComplianceCardData(BaseModel):
 
 
 # Role-based report type mappings
-ROLE_REPORT_TYPES = {
-    "shift_incharge": [
+ROLE_REPORT_TYPES = MappingProxyType({
+    "shift_incharge": (
         ReportType.SHIFT_SUMMARY,
         ReportType.SHIFT_HANDOVER,
         ReportType.ENTRY_EXIT_LOG,
         ReportType.ALERT_RESOLUTION,
-    ],
-    "safety_officer": [
+    ),
+    "safety_officer": (
         ReportType.WEEKLY_COMPLIANCE,
         ReportType.HIGH_RISK_WORKERS,
         ReportType.ZONE_RISK_ANALYSIS,
         ReportType.VIOLATION_TRENDS,
         ReportType.SHIFT_SUMMARY,
         ReportType.ENTRY_EXIT_LOG,
-    ],
-    "manager": [
+    ),
+    "manager": (
         ReportType.DAILY_OPERATIONS,
         ReportType.SHIFT_PERFORMANCE,
         ReportType.WORKER_RANKINGS,
@@ -256,146 +284,151 @@ ROLE_REPORT_TYPES = {
         ReportType.ESCALATION_REPORT,
         ReportType.WEEKLY_COMPLIANCE,
         ReportType.SHIFT_SUMMARY,
-    ],
-    "area_safety_officer": [
+    ),
+    "area_safety_officer": (
         ReportType.MINE_COMPARISON,
         ReportType.RISK_HEATMAP,
         ReportType.CRITICAL_INCIDENTS,
         ReportType.COMPLIANCE_LEADERBOARD,
         ReportType.WEEKLY_COMPLIANCE,
         ReportType.DAILY_OPERATIONS,
-    ],
-    "general_manager": [
+    ),
+    "general_manager": (
         ReportType.EXECUTIVE_SUMMARY,
         ReportType.KPI_DASHBOARD,
         ReportType.REGULATORY_COMPLIANCE,
         ReportType.FINANCIAL_IMPACT,
         ReportType.MINE_COMPARISON,
         ReportType.MONTHLY_SUMMARY,
-    ],
-    "super_admin": list(ReportType),  # All report types
-    "worker": [
+    ),
+    "super_admin": tuple(ReportType),  # All report types
+    "worker": (
         ReportType.COMPLIANCE_CARD,
         ReportType.WORKER_MONTHLY,
-    ],
-}
+    ),
+})
+
+# Same mappings as sets, for access checks
+ROLE_REPORT_TYPE_SETS = MappingProxyType({
+    role: frozenset(types) for role, types in ROLE_REPORT_TYPES.items()
+})
 
 
 # Report type metadata
-REPORT_TYPE_INFO = {
+REPORT_TYPE_INFO = MappingProxyType({
     ReportType.SHIFT_SUMMARY: {
         "name": "Shift Summary Report",
         "description": "Summary of shift operations including entries, exits, compliance, and alerts",
-        "parameters": ["shift", "gate_id", "date"],
+        "parameters": ("shift", "gate_id", "date"),
     },
     ReportType.SHIFT_HANDOVER: {
         "name": "Shift Handover Report",
         "description": "Handover notes including outstanding issues and workers currently inside",
-        "parameters": ["shift", "date"],
+        "parameters": ("shift", "date"),
     },
     ReportType.ENTRY_EXIT_LOG: {
         "name": "Entry/Exit Log",
         "description": "Detailed log of all gate entries and exits with PPE status",
-        "parameters": ["date_range", "gate_id", "worker_id"],
+        "parameters": ("date_range", "gate_id", "worker_id"),
     },
     ReportType.ALERT_RESOLUTION: {
         "name": "Alert Resolution Report",
         "description": "Summary of alerts triggered and resolved during the period",
-        "parameters": ["date_range", "severity"],
+        "parameters": ("date_range", "severity"),
     },
     ReportType.WEEKLY_COMPLIANCE: {
         "name": "Weekly Compliance Report",
         "description": "Compliance trends and violation breakdown over the week",
-        "parameters": ["date_range", "zone_id"],
+        "parameters": ("date_range", "zone_id"),
     },
     ReportType.HIGH_RISK_WORKERS: {
         "name": "High-Risk Workers Report",
         "description": "Workers with low compliance scores and intervention recommendations",
-        "parameters": ["threshold", "include_predictions"],
+        "parameters": ("threshold", "include_predictions"),
     },
     ReportType.ZONE_RISK_ANALYSIS: {
         "name": "Zone Risk Analysis",
         "description": "Risk levels and violation patterns by zone",
-        "parameters": ["date_range"],
+        "parameters": ("date_range",),
     },
     ReportType.VIOLATION_TRENDS: {
         "name": "Violation Trends Report",
         "description": "Month-over-month violation comparison and repeat offenders",
-        "parameters": ["date_range", "group_by"],
+        "parameters": ("date_range", "group_by"),
     },
     ReportType.DAILY_OPERATIONS: {
         "name": "Daily Operations Summary",
         "description": "Daily operational metrics including attendance and compliance",
-        "parameters": ["date"],
+        "parameters": ("date",),
     },
     ReportType.SHIFT_PERFORMANCE: {
         "name": "Shift Performance Report",
         "description": "Comparison of day, afternoon, and night shift performance",
-        "parameters": ["date_range"],
+        "parameters": ("date_range",),
     },
     ReportType.WORKER_RANKINGS: {
         "name": "Worker Rankings Report",
         "description": "Top performers and workers needing improvement",
-        "parameters": ["limit", "include_predictions"],
+        "parameters": ("limit", "include_predictions"),
     },
     ReportType.MONTHLY_SUMMARY: {
         "name": "Monthly Summary Report",
         "description": "Comprehensive monthly KPIs and trend analysis",
-        "parameters": ["month", "year"],
+        "parameters": ("month", "year"),
     },
     ReportType.ESCALATION_REPORT: {
         "name": "Escalation Report",
         "description": "Pending and resolved escalations with resolution times",
-        "parameters": ["date_range", "status"],
+        "parameters": ("date_range", "status"),
     },
     ReportType.MINE_COMPARISON: {
         "name": "Mine Comparison Report",
         "description": "Side-by-side comparison of multiple mines",
-        "parameters": ["mine_ids", "date_range"],
+        "parameters": ("mine_ids", "date_range"),
     },
     ReportType.RISK_HEATMAP: {
         "name": "Risk Heatmap Report",
         "description": "Zone-level risk visualization across mines",
-        "parameters": ["mine_ids", "date_range"],
+        "parameters": ("mine_ids", "date_range"),
     },
     ReportType.CRITICAL_INCIDENTS: {
         "name": "Critical Incidents Report",
         "description": "High and critical severity incidents across mines",
-        "parameters": ["mine_ids", "date_range", "severity"],
+        "parameters": ("mine_ids", "date_range", "severity"),
     },
     ReportType.COMPLIANCE_LEADERBOARD: {
         "name": "Compliance Leaderboard",
         "description": "Ranking of mines and zones by compliance performance",
-        "parameters": ["date_range"],
+        "parameters": ("date_range",),
     },
     ReportType.EXECUTIVE_SUMMARY: {
         "name": "Executive Summary",
         "description": "Organization-wide KPIs and strategic insights",
-        "parameters": ["date_range"],
+        "parameters": ("date_range",),
     },
     ReportType.KPI_DASHBOARD: {
         "name": "KPI Dashboard Report",
         "description": "Key performance indicators with trend analysis",
-        "parameters": ["date_range", "compare_previous"],
+        "parameters": ("date_range", "compare_previous"),
     },
     ReportType.REGULATORY_COMPLIANCE: {
         "name": "Regulatory Compliance Report",
         "description": "Compliance status against regulatory thresholds",
-        "parameters": ["date_range"],
+        "parameters": ("date_range",),
     },
     ReportType.FINANCIAL_IMPACT: {
         "name": "Financial Impact Report",
         "description": "Cost savings and incident prevention metrics",
-        "parameters": ["date_range"],
+        "parameters": ("date_range",),
     },
     ReportType.COMPLIANCE_CARD: {
         "name": "Personal Compliance Card",
         "description": "Individual worker compliance summary and badges",
-        "parameters": ["worker_id"],
+        "parameters": ("worker_id",),
     },
     ReportType.WORKER_MONTHLY: {
         "name": "Worker Monthly Summary",
         "description": "Monthly personal performance and violation history",
-        "parameters": ["worker_id", "month", "year"],
+        "parameters": ("worker_id", "month", "year"),
     },
-}
+})
@@ -1,10 +1,26 @@
 """
 Report services package.
+
+Services are imported on first access so that importing one of them (or
+the package) doesn't pull in ReportLab, xlsxwriter and the SMTP stack.
 """
 
-from .data_aggregator import DataAggregator
-from .pdf_generator import PDFGenerator
-from .excel_generator import ExcelGenerator
-from .email_service import EmailService
+import importlib
+
+__all__ = ["DataAggregator", "PDFGenerator", "ExcelGenerator", "EmailService", "ReportCache"]
+
+_LAZY = {
+    "DataAggregator": ".data_aggregator",
+    "PDFGenerator": ".pdf_generator",
+    "ExcelGenerator": ".excel_generator",
+    "EmailService": ".email_service",
+    "ReportCache": ".report_cache",
+}
+
 
-__all__ = ["DataAggregator", "PDFGenerator", "ExcelGenerator", "EmailService"]
+def __getattr__(name):
+    if name in _LAZY:
+        obj = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = obj
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
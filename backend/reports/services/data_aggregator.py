@@ -4,11 +4,285 @@ Data aggregation service for report generation.
 Provides role-specific data queries from MongoDB collections.
 """
 
+import asyncio
+import os
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from bson import ObjectId
 
 
+# Days of history to roll up the first time the rollup job runs
+ROLLUP_BACKFILL_DAYS = int(os.getenv("REPORT_ROLLUP_BACKFILL_DAYS", "90"))
+
+# Already rolled-up days rebuilt on every run, to pick up late gate entries
+ROLLUP_REFRESH_DAYS = int(os.getenv("REPORT_ROLLUP_REFRESH_DAYS", "7"))
+
+# Cursor batch size for scans that are counted while streaming
+SCAN_BATCH_SIZE = 2000
+
+# Mines queried at once by multi-mine reports, to keep the connection pool free
+MINE_FANOUT_LIMIT = int(os.getenv("REPORT_MINE_FANOUT_LIMIT", "8"))
+
+
+# Shared expressions
+_COMPLIANT_SUM = {"$sum": {"$cond": [{"$ifNull": ["$ppe_compliant", False]}, 1, 0]}}
+
+# Violations may be plain strings or {"type": ...} dicts
+_VIOLATION_TYPE = {"$cond": [
+    {"$eq": [{"$type": "$violations"}, "object"]},
+    {"$ifNull": ["$violations.type", "unknown"]},
+    {"$toString": "$violations"}
+]}
+
+_HAS_VIOLATIONS = {"$cond": [{"$gt": [{"$size": {"$ifNull": ["$violations", []]}}, 0]}, 1, 0]}
+
+_DAY = {"$dateTrunc": {"date": "$timestamp", "unit": "day"}}
+
+# Static aggregation stages, built once. Only the leading $match stage
+# depends on the request, so each call prepends it to these tails.
+# For a single mine, sorting in index order lets the server walk
+# (mine_id, worker_id, timestamp) and take each worker's latest entry instead
+# of sorting every entry in memory. Across all mines the sort must not lead
+# with mine_id, or $first would pick the latest entry at the lowest mine_id.
+_WORKERS_INSIDE_INDEX = [("mine_id", 1), ("worker_id", 1), ("timestamp", -1)]
+_WORKERS_INSIDE_MINE_SORT = {"$sort": {"mine_id": 1, "worker_id": 1, "timestamp": -1}}
+_WORKERS_INSIDE_ALL_SORT = {"$sort": {"worker_id": 1, "timestamp": -1}}
+
+_WORKERS_INSIDE_STAGES = (
+    {"$group": {
+        "_id": "$worker_id",
+        "last_entry_type": {"$first": "$entry_type"}
+    }},
+    {"$match": {"last_entry_type": "entry"}},
+    {"$count": "n"}
+)
+
+_ZONE_ANALYSIS_STAGES = (
+    {"$group": {
+        "_id": "$zone_id",
+        "total_entries": {"$sum": 1},
+        "violations": {"$sum": _HAS_VIOLATIONS}
+    }},
+)
+
+# Compliance trend periods: $dateTrunc options and the label format per group_by.
+# Anything other than day or week is grouped by month.
+_TREND_PERIODS = {
+    "day": ({"unit": "day"}, "%Y-%m-%d"),
+    "week": ({"unit": "week", "startOfWeek": "monday"}, "%Y-W%W"),
+    "month": ({"unit": "month"}, "%Y-%m"),
+}
+
+# Facets for get_compliance_data: one scan of the matched entries feeds
+# every summary. The "trend" facet is added per group_by below.
+_COMPLIANCE_FACETS = {
+    "totals": [
+        {"$group": {"_id": None, "total": {"$sum": 1}, "compliant": _COMPLIANT_SUM}}
+    ],
+    "violations_by_type": [
+        {"$unwind": "$violations"},
+        {"$group": {"_id": _VIOLATION_TYPE, "count": {"$sum": 1}}},
+        {"$sort": {"count": -1}}
+    ],
+    "zones": list(_ZONE_ANALYSIS_STAGES)
+}
+
+# The same facets computed from daily_rollups instead of raw entries
+_ROLLUP_COMPLIANCE_FACETS = {
+    "totals": [
+        {"$group": {"_id": None, "total": {"$sum": "$total"}, "compliant": {"$sum": "$compliant"}}}
+    ],
+    "zones": [
+        {"$group": {
+            "_id": "$zone_id",
+            "total_entries": {"$sum": "$total"},
+            "violations": {"$sum": "$violations"}
+        }}
+    ]
+}
+
+# Full facet sets per group_by, with trend buckets truncated on the server
+_COMPLIANCE_FACETS_BY_PERIOD = {
+    group_by: {**_COMPLIANCE_FACETS, "trend": [
+        {"$group": {
+            "_id": {"$dateTrunc": {"date": "$timestamp", **trunc}},
+            "total": {"$sum": 1},
+            "compliant": _COMPLIANT_SUM
+        }},
+        {"$sort": {"_id": 1}}
+    ]}
+    for group_by, (trunc, _) in _TREND_PERIODS.items()
+}
+
+_ROLLUP_COMPLIANCE_FACETS_BY_PERIOD = {
+    group_by: {**_ROLLUP_COMPLIANCE_FACETS, "trend": [
+        {"$group": {
+            "_id": {"$dateTrunc": {"date": "$date", **trunc}},
+            "total": {"$sum": "$total"},
+            "compliant": {"$sum": "$compliant"}
+        }},
+        {"$sort": {"_id": 1}}
+    ]}
+    for group_by, (trunc, _) in _TREND_PERIODS.items()
+}
+
+# Rollup pipelines: per (mine, day, zone) entry counts and per (mine, day,
+# violation type) counts, each merged into its own collection.
+_DAILY_ROLLUP_STAGES = (
+    {"$group": {
+        "_id": {"mine_id": "$mine_id", "date": _DAY, "zone_id": "$zone_id"},
+        "total": {"$sum": 1},
+        "compliant": _COMPLIANT_SUM,
+        "violations": {"$sum": _HAS_VIOLATIONS}
+    }},
+    {"$set": {"mine_id": "$_id.mine_id", "date": "$_id.date", "zone_id": "$_id.zone_id"}},
+    {"$merge": {"into": "daily_rollups", "whenMatched": "replace", "whenNotMatched": "insert"}}
+)
+
+_DAILY_VIOLATION_ROLLUP_STAGES = (
+    {"$unwind": "$violations"},
+    {"$group": {
+        "_id": {"mine_id": "$mine_id", "date": _DAY, "type": _VIOLATION_TYPE},
+        "count": {"$sum": 1}
+    }},
+    {"$set": {"mine_id": "$_id.mine_id", "date": "$_id.date", "type": "$_id.type"}},
+    {"$merge": {"into": "daily_violation_rollups", "whenMatched": "replace", "whenNotMatched": "insert"}}
+)
+
+# Facets for get_shift_summary: shift counters and per-hour buckets in one scan
+_SHIFT_SUMMARY_FACETS = {
+    "totals": [
+        {"$group": {
+            "_id": None,
+            "total": {"$sum": 1},
+            "entered": {"$sum": {"$cond": [{"$eq": ["$entry_type", "entry"]}, 1, 0]}},
+            "exited": {"$sum": {"$cond": [{"$eq": ["$entry_type", "exit"]}, 1, 0]}},
+            "compliant": _COMPLIANT_SUM,
+            "violations": {"$sum": {"$size": {"$ifNull": ["$violations", []]}}}
+        }}
+    ],
+    "hourly": [
+        {"$group": {
+            "_id": {"$hour": "$timestamp"},
+            "entries": {"$sum": 1},
+            "violations": {"$sum": {"$size": {"$ifNull": ["$violations", []]}}}
+        }}
+    ]
+}
+
+# Count distinct workers without shipping their ids to the client
+_DISTINCT_WORKERS_COUNT_STAGES = (
+    {"$group": {"_id": "$worker_id"}},
+    {"$count": "n"}
+)
+
+# Facets for _count_violations: violating entries and violations per type
+_VIOLATION_COUNT_FACETS = {
+    "total": [{"$count": "n"}],
+    "by_type": [
+        {"$unwind": "$violations"},
+        {"$group": {"_id": _VIOLATION_TYPE, "count": {"$sum": 1}}},
+        {"$sort": {"count": -1}}
+    ]
+}
+
+# Resolved and pending alert counts as a single document
+_ALERT_COUNTS_GROUP = {"$group": {
+    "_id": None,
+    "resolved": {"$sum": {"$cond": [{"$eq": ["$status", "resolved"]}, 1, 0]}},
+    "pending": {"$sum": {"$cond": [{"$eq": ["$status", "active"]}, 1, 0]}}
+}}
+
+# Projections: only the fields each read path consumes
+_ENTRY_LOG_PROJECTION = {
+    "worker_id": 1, "employee_id": 1, "worker_name": 1, "entry_type": 1,
+    "timestamp": 1, "ppe_compliant": 1, "violations": 1, "status": 1
+}
+_ALERT_PROJECTION = {
+    "alert_type": 1, "severity": 1, "message": 1, "status": 1, "created_at": 1
+}
+_WORKER_PROJECTION = {
+    "employee_id": 1, "name": 1, "compliance_score": 1, "total_violations": 1, "zone_id": 1
+}
+_RANKING_PROJECTION = {"_id": 0, "employee_id": 1, "name": 1, "compliance_score": 1}
+_MINE_PROJECTION = {"name": 1, "location": 1}
+_NAME_PROJECTION = {"name": 1}
+
+# Facets for _get_worker_attendance: entries and distinct days with an entry
+_ATTENDANCE_FACETS = {
+    "entries": [{"$count": "n"}],
+    "days": [
+        {"$group": {"_id": _DAY}},
+        {"$count": "n"}
+    ]
+}
+
+# Compliance streak: newest-first days with entries, counted until a day
+# with a violation or a gap of more than one day
+_COMPLIANCE_STREAK_STAGES = (
+    {"$sort": {"timestamp": -1}},
+    {"$limit": 90},
+    {"$group": {"_id": _DAY, "has_violation": {"$max": _HAS_VIOLATIONS}}},
+    {"$sort": {"_id": -1}},
+    {"$group": {"_id": None, "days": {"$push": {"day": "$_id", "has_violation": "$has_violation"}}}},
+    {"$project": {"_id": 0, "streak": {"$let": {
+        "vars": {"walk": {"$reduce": {
+            "input": "$days",
+            "initialValue": {"n": 0, "prev": None, "done": False},
+            "in": {"$cond": [
+                {"$or": [
+                    "$$value.done",
+                    {"$eq": ["$$this.has_violation", 1]},
+                    {"$and": [
+                        {"$ne": ["$$value.prev", None]},
+                        {"$gt": [
+                            {"$dateDiff": {"startDate": "$$this.day", "endDate": "$$value.prev", "unit": "day"}},
+                            1
+                        ]}
+                    ]}
+                ]},
+                {"n": "$$value.n", "prev": "$$value.prev", "done": True},
+                {"n": {"$add": ["$$value.n", 1]}, "prev": "$$this.day", "done": False}
+            ]}
+        }}},
+        "in": "$$walk.n"
+    }}}}
+)
+
+_CRITICAL_INCIDENT_STAGES = (
+    {"$sort": {"created_at": -1}},
+    {"$limit": 100},
+    {"$lookup": {
+        "from": "mines",
+        "localField": "mine_id",
+        "foreignField": "_id",
+        "pipeline": [{"$project": {"name": 1}}],
+        "as": "mine"
+    }},
+    {"$project": {
+        "alert_type": 1, "severity": 1, "message": 1, "status": 1, "created_at": 1,
+        "mine_name": {"$arrayElemAt": ["$mine.name", 0]}
+    }}
+)
+
+_REPEAT_OFFENDERS_GROUP = {"$group": {
+    "_id": "$worker_id",
+    "violation_count": {"$sum": 1}
+}}
+
+
+@lru_cache(maxsize=1024)
+def _object_id(value: str) -> ObjectId:
+    """Parse an id string into an ObjectId, once per distinct value."""
+    return ObjectId(value)
+
+
+def _mine_match(mine_id: Optional[str]):
+    """Filter value for mine_id: the given mine, or any mine."""
+    return _object_id(mine_id) if mine_id else {"$exists": True}
+
+
 class DataAggregator:
     """
     Service for aggregating data from various collections for reports.
@@ -59,41 +333,52 @@ class DataAggregator:
             end_time = date.replace(hour=end_hour, minute=0, second=0)
 
         # Build query
+        mine_match = _mine_match(mine_id)
         query = {
-            "mine_id": ObjectId(mine_id) if mine_id else {"$exists": True},
+            "mine_id": mine_match,
             "timestamp": {"$gte": start_time, "$lt": end_time}
         }
         if gate_id:
-            query["gate_id"] = ObjectId(gate_id)
+            query["gate_id"] = _object_id(gate_id)
 
-        # Get gate entries
-        entries = await self.db.gate_entries.find(query).to_list(length=None)
+        alert_query = {
+            "mine_id": mine_match,
+            "created_at": {"$gte": start_time, "$lt": end_time}
+        }
+
+        # Shift counters and hourly buckets come from one $facet; only the
+        # first 100 entries are fetched for the log. The queries are
+        # independent, so they run concurrently.
+        facets, entries, alert_results, currently_inside = await asyncio.gather(
+            self.db.gate_entries.aggregate([
+                {"$match": query},
+                {"$facet": _SHIFT_SUMMARY_FACETS}
+            ]).to_list(length=1),
+            self.db.gate_entries.find(query, _ENTRY_LOG_PROJECTION).sort("timestamp", 1).to_list(length=100),
+            self.db.alerts.aggregate([{"$match": alert_query}, _ALERT_COUNTS_GROUP]).to_list(length=1),
+            self._get_workers_inside(mine_id, end_time)
+        )
+        facets = facets[0]
 
         # Calculate metrics
-        workers_entered = len([e for e in entries if e.get("entry_type") == "entry"])
-        workers_exited = len([e for e in entries if e.get("entry_type") == "exit"])
+        totals = facets["totals"][0] if facets["totals"] else {
+            "total": 0, "entered": 0, "exited": 0, "compliant": 0, "violations": 0
+        }
+        workers_entered = totals["entered"]
+        workers_exited = totals["exited"]
 
-        compliant_entries = len([e for e in entries if e.get("ppe_compliant", False)])
-        total_entries = len(entries)
-        compliance_rate = (compliant_entries / total_entries * 100) if total_entries > 0 else 0
+        total_entries = totals["total"]
+        compliance_rate = (totals["compliant"] / total_entries * 100) if total_entries > 0 else 0
 
-        violations = [e for e in entries if e.get("violations")]
-        violations_count = sum(len(e.get("violations", [])) for e in entries)
+        violations_count = totals["violations"]
 
-        # Get alerts for this shift
-        alert_query = {
-            "mine_id": ObjectId(mine_id) if mine_id else {"$exists": True},
-            "created_at": {"$gte": start_time, "$lt": end_time}
-        }
-        alerts = await self.db.alerts.find(alert_query).to_list(length=None)
-        alerts_resolved = len([a for a in alerts if a.get("status") == "resolved"])
-        alerts_pending = len([a for a in alerts if a.get("status") == "active"])
+        # Alerts for this shift
+        alert_counts = alert_results[0] if alert_results else {"resolved": 0, "pending": 0}
+        alerts_resolved = alert_counts["resolved"]
+        alerts_pending = alert_counts["pending"]
 
         # Hourly breakdown
-        hourly_breakdown = await self._get_hourly_breakdown(entries, start_time, end_time)
-
-        # Get workers currently inside
-        currently_inside = await self._get_workers_inside(mine_id, end_time)
+        hourly_breakdown = self._get_hourly_breakdown(facets["hourly"], start_time, end_time)
 
         return {
             "shift_info": {
@@ -109,7 +394,7 @@ class DataAggregator:
             "violations_count": violations_count,
             "alerts_resolved": alerts_resolved,
             "alerts_pending": alerts_pending,
-            "entry_exit_logs": [self._format_entry(e) for e in entries[:100]],
+            "entry_exit_logs": [self._format_entry(e) for e in entries],
             "hourly_breakdown": hourly_breakdown
         }
 
@@ -122,18 +407,49 @@ class DataAggregator:
         worker_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Get detailed entry/exit log."""
+        cursor = self.entry_exit_log_cursor(mine_id, start_date, end_date, gate_id, worker_id)
+        entries = await cursor.to_list(length=1000)
+        return [self._format_entry(e) for e in entries]
+
+    def entry_exit_log_cursor(
+        self,
+        mine_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        gate_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        batch_size: int = 1000
+    ):
+        """
+        Get a cursor over the entry/exit log, newest first.
+
+        Documents are fetched from MongoDB in batches as the cursor is
+        iterated, so callers can stream logs of any length.
+        """
         query = {
             "timestamp": {"$gte": start_date, "$lt": end_date}
         }
         if mine_id:
-            query["mine_id"] = ObjectId(mine_id)
+            query["mine_id"] = _object_id(mine_id)
         if gate_id:
-            query["gate_id"] = ObjectId(gate_id)
+            query["gate_id"] = _object_id(gate_id)
         if worker_id:
-            query["worker_id"] = ObjectId(worker_id)
+            query["worker_id"] = _object_id(worker_id)
 
-        entries = await self.db.gate_entries.find(query).sort("timestamp", -1).to_list(length=1000)
-        return [self._format_entry(e) for e in entries]
+        return self.db.gate_entries.find(query, _ENTRY_LOG_PROJECTION).sort("timestamp", -1).batch_size(batch_size)
+
+    async def iter_entry_exit_log(
+        self,
+        mine_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        gate_id: Optional[str] = None,
+        worker_id: Optional[str] = None
+    ):
+        """Stream the entry/exit log, formatted like get_entry_exit_log."""
+        cursor = self.entry_exit_log_cursor(mine_id, start_date, end_date, gate_id, worker_id)
+        async for entry in cursor:
+            yield self._format_entry(entry)
 
     # ==================== Safety Officer Data ====================
 
@@ -156,38 +472,26 @@ class DataAggregator:
         Returns:
             Compliance analytics data
         """
-        query = {"timestamp": {"$gte": start_date, "$lt": end_date}}
-        if mine_id:
-            query["mine_id"] = ObjectId(mine_id)
-
-        entries = await self.db.gate_entries.find(query).to_list(length=None)
+        # Compliance facets and high risk workers are independent
+        period = group_by if group_by in _TREND_PERIODS else "month"
+        facets, high_risk_workers = await asyncio.gather(
+            self._get_compliance_facets(mine_id, start_date, end_date, period),
+            self.get_high_risk_workers(mine_id, threshold=70)
+        )
 
         # Overall compliance
-        total = len(entries)
-        compliant = len([e for e in entries if e.get("ppe_compliant", False)])
-        overall_compliance = (compliant / total * 100) if total > 0 else 0
+        totals = facets["totals"][0] if facets["totals"] else {"total": 0, "compliant": 0}
+        total = totals["total"]
+        overall_compliance = (totals["compliant"] / total * 100) if total > 0 else 0
 
         # Compliance trend
-        compliance_trend = await self._get_compliance_trend(entries, group_by)
+        compliance_trend = self._get_compliance_trend(facets["trend"], period)
 
         # Violations by type
-        violations_by_type = {}
-        for entry in entries:
-            for violation in entry.get("violations", []):
-                # Handle both string violations (e.g., "NO-Helmet") and dict violations
-                if isinstance(violation, str):
-                    v_type = violation
-                elif isinstance(violation, dict):
-                    v_type = violation.get("type", "unknown")
-                else:
-                    v_type = str(violation)
-                violations_by_type[v_type] = violations_by_type.get(v_type, 0) + 1
+        violations_by_type = {r["_id"]: r["count"] for r in facets["violations_by_type"]}
 
         # Zone analysis
-        zone_analysis = await self._get_zone_analysis(mine_id, start_date, end_date)
-
-        # High risk workers
-        high_risk_workers = await self.get_high_risk_workers(mine_id, threshold=70)
+        zone_analysis = await self._format_zone_analysis(facets["zones"])
 
         return {
             "overall_compliance": round(overall_compliance, 1),
@@ -205,18 +509,26 @@ class DataAggregator:
         """Get workers with compliance score below threshold."""
         query = {"compliance_score": {"$lt": threshold}, "is_active": True}
         if mine_id:
-            query["mine_id"] = ObjectId(mine_id)
+            query["mine_id"] = _object_id(mine_id)
 
-        workers = await self.db.workers.find(query).sort("compliance_score", 1).to_list(length=50)
+        workers = await self.db.workers.find(query, _WORKER_PROJECTION).sort("compliance_score", 1).to_list(length=50)
+
+        # Recent violation counts for all of these workers in one aggregation
+        counts = {
+            r["_id"]: r["count"]
+            for r in await self.db.gate_entries.aggregate([
+                {"$match": {
+                    "worker_id": {"$in": [w["_id"] for w in workers]},
+                    "violations": {"$exists": True, "$ne": []},
+                    "timestamp": {"$gte": datetime.utcnow() - timedelta(days=30)}
+                }},
+                {"$group": {"_id": "$worker_id", "count": {"$sum": 1}}}
+            ]).to_list(length=None)
+        }
 
         result = []
         for w in workers:
-            # Get recent violations
-            violations = await self.db.gate_entries.count_documents({
-                "worker_id": w["_id"],
-                "violations": {"$exists": True, "$ne": []},
-                "timestamp": {"$gte": datetime.utcnow() - timedelta(days=30)}
-            })
+            violations = counts.get(w["_id"], 0)
 
             result.append({
                 "worker_id": str(w["_id"]),
@@ -237,17 +549,17 @@ class DataAggregator:
         end_date: datetime
     ) -> Dict[str, Any]:
         """Get violation trends with month-over-month comparison."""
-        # Current period
-        current_violations = await self._count_violations(mine_id, start_date, end_date)
-
         # Previous period (same duration)
         duration = end_date - start_date
         prev_start = start_date - duration
         prev_end = start_date
-        prev_violations = await self._count_violations(mine_id, prev_start, prev_end)
 
-        # Repeat offenders
-        repeat_offenders = await self._get_repeat_offenders(mine_id, start_date, end_date)
+        # Current period, previous period and repeat offenders concurrently
+        current_violations, prev_violations, repeat_offenders = await asyncio.gather(
+            self._count_violations(mine_id, start_date, end_date),
+            self._count_violations(mine_id, prev_start, prev_end),
+            self._get_repeat_offenders(mine_id, start_date, end_date)
+        )
 
         return {
             "current_period": current_violations,
@@ -265,36 +577,56 @@ class DataAggregator:
         end_date: datetime
     ) -> Dict[str, Any]:
         """Get operations summary for manager report."""
-        # Worker counts
-        total_workers = await self.db.workers.count_documents({
-            "mine_id": ObjectId(mine_id) if mine_id else {"$exists": True},
-            "is_active": True
-        })
+        operations, _ = await self._get_operations_and_compliance(mine_id, start_date, end_date)
+        return operations
 
+    async def _get_operations_and_compliance(
+        self,
+        mine_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        group_by: str = "day"
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Get the operations summary along with the compliance data behind it.
+
+        Callers that also need the compliance trend reuse the returned
+        compliance data instead of querying it a second time.
+        """
         # Active workers (entered today)
         active_query = {
             "entry_type": "entry",
             "timestamp": {"$gte": start_date, "$lt": end_date}
         }
         if mine_id:
-            active_query["mine_id"] = ObjectId(mine_id)
-
-        active_entries = await self.db.gate_entries.distinct("worker_id", active_query)
-        active_workers = len(active_entries)
-
-        # Compliance
-        compliance_data = await self.get_compliance_data(mine_id, start_date, end_date)
-
-        # Shift performance
-        shift_performance = await self._get_shift_performance(mine_id, start_date, end_date)
-
-        # Worker rankings
-        worker_rankings = await self._get_worker_rankings(mine_id)
-
-        # Escalations
-        escalations = await self._get_escalations(mine_id, start_date, end_date)
-
-        return {
+            active_query["mine_id"] = _object_id(mine_id)
+
+        # Worker counts, compliance, shift performance, rankings and
+        # escalations are independent, so they are fetched concurrently
+        (
+            total_workers,
+            active_counts,
+            compliance_data,
+            shift_performance,
+            worker_rankings,
+            escalations
+        ) = await asyncio.gather(
+            self.db.workers.count_documents({
+                "mine_id": _mine_match(mine_id),
+                "is_active": True
+            }),
+            self.db.gate_entries.aggregate([
+                {"$match": active_query},
+                *_DISTINCT_WORKERS_COUNT_STAGES
+            ]).to_list(length=1),
+            self.get_compliance_data(mine_id, start_date, end_date, group_by),
+            self._get_shift_performance(mine_id, start_date, end_date),
+            self._get_worker_rankings(mine_id),
+            self._get_escalations(mine_id, start_date, end_date)
+        )
+        active_workers = active_counts[0]["n"] if active_counts else 0
+
+        operations = {
             "total_workers": total_workers,
             "active_workers": active_workers,
             "compliance_rate": compliance_data["overall_compliance"],
@@ -303,6 +635,7 @@ class DataAggregator:
             "escalations": escalations,
             "violations_by_type": compliance_data["violations_by_type"]
         }
+        return operations, compliance_data
 
     async def get_monthly_summary(
         self,
@@ -317,9 +650,12 @@ class DataAggregator:
         else:
             end_date = datetime(year, month + 1, 1)
 
-        operations = await self.get_operations_data(mine_id, start_date, end_date)
-        compliance = await self.get_compliance_data(mine_id, start_date, end_date, "week")
-        trends = await self.get_violation_trends(mine_id, start_date, end_date)
+        # Compliance is computed once, grouped by week, and shared with the
+        # operations summary
+        (operations, compliance), trends = await asyncio.gather(
+            self._get_operations_and_compliance(mine_id, start_date, end_date, "week"),
+            self.get_violation_trends(mine_id, start_date, end_date)
+        )
 
         return {
             **operations,
@@ -338,30 +674,19 @@ class DataAggregator:
         end_date: datetime
     ) -> Dict[str, Any]:
         """Get comparison data across multiple mines."""
-        mines_data = []
-
-        for mine_id in mine_ids:
-            mine_info = await self.db.mines.find_one({"_id": ObjectId(mine_id)})
-            if not mine_info:
-                continue
-
-            compliance = await self.get_compliance_data(mine_id, start_date, end_date)
-
-            # Get worker count
-            worker_count = await self.db.workers.count_documents({
-                "mine_id": ObjectId(mine_id),
-                "is_active": True
-            })
+        # All mine documents in one query
+        mines = {
+            str(m["_id"]): m
+            for m in await self.db.mines.find(
+                {"_id": {"$in": [_object_id(m) for m in mine_ids]}}, _MINE_PROJECTION
+            ).to_list(length=None)
+        }
 
-            mines_data.append({
-                "mine_id": mine_id,
-                "mine_name": mine_info.get("name"),
-                "location": mine_info.get("location"),
-                "worker_count": worker_count,
-                "compliance_rate": compliance["overall_compliance"],
-                "violations_by_type": compliance["violations_by_type"],
-                "high_risk_workers": len(compliance["high_risk_workers"])
-            })
+        # Mines are independent, so their rows are built concurrently
+        mines_data = await self._gather_per_mine(
+            self._get_mine_comparison_row(mine_id, mines[mine_id], start_date, end_date)
+            for mine_id in mine_ids if mine_id in mines
+        )
 
         # Sort by compliance rate
         mines_data.sort(key=lambda x: x["compliance_rate"], reverse=True)
@@ -372,6 +697,32 @@ class DataAggregator:
             "needs_attention": [m for m in mines_data if m["compliance_rate"] < 80]
         }
 
+    async def _get_mine_comparison_row(
+        self,
+        mine_id: str,
+        mine_info: Dict,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[str, Any]:
+        """Get the comparison row for one mine."""
+        compliance, worker_count = await asyncio.gather(
+            self.get_compliance_data(mine_id, start_date, end_date),
+            self.db.workers.count_documents({
+                "mine_id": _object_id(mine_id),
+                "is_active": True
+            })
+        )
+
+        return {
+            "mine_id": mine_id,
+            "mine_name": mine_info.get("name"),
+            "location": mine_info.get("location"),
+            "worker_count": worker_count,
+            "compliance_rate": compliance["overall_compliance"],
+            "violations_by_type": compliance["violations_by_type"],
+            "high_risk_workers": len(compliance["high_risk_workers"])
+        }
+
     async def get_risk_heatmap(
         self,
         mine_ids: List[str],
@@ -379,40 +730,50 @@ class DataAggregator:
         end_date: datetime
     ) -> List[Dict[str, Any]]:
         """Get zone-level risk data for heatmap visualization."""
-        heatmap_data = []
+        # Mines are independent, so their rows are built concurrently
+        rows = await self._gather_per_mine(
+            self._get_mine_heatmap(mine_id, start_date, end_date) for mine_id in mine_ids
+        )
+        return [row for mine_rows in rows for row in mine_rows]
 
-        for mine_id in mine_ids:
-            zones = await self.db.zones.find({"mine_id": ObjectId(mine_id)}).to_list(length=None)
-
-            for zone in zones:
-                zone_id = str(zone["_id"])
+    async def _get_mine_heatmap(
+        self,
+        mine_id: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[Dict[str, Any]]:
+        """Get heatmap rows for every zone of one mine."""
+        mine_oid = _object_id(mine_id)
+
+        # Zone names and per-zone counts for the whole mine in two queries
+        zones, results = await asyncio.gather(
+            self.db.zones.find({"mine_id": mine_oid}, _NAME_PROJECTION).to_list(length=None),
+            self.db.gate_entries.aggregate([
+                {"$match": {"mine_id": mine_oid, "timestamp": {"$gte": start_date, "$lt": end_date}}},
+                *_ZONE_ANALYSIS_STAGES
+            ]).to_list(length=None)
+        )
+        counts = {r["_id"]: r for r in results}
 
-                # Count violations in zone
-                violation_count = await self.db.gate_entries.count_documents({
-                    "zone_id": zone["_id"],
-                    "violations": {"$exists": True, "$ne": []},
-                    "timestamp": {"$gte": start_date, "$lt": end_date}
-                })
+        heatmap_data = []
+        for zone in zones:
+            r = counts.get(zone["_id"], {"total_entries": 0, "violations": 0})
+            violation_count = r["violations"]
+            total_entries = r["total_entries"]
 
-                # Count total entries
-                total_entries = await self.db.gate_entries.count_documents({
-                    "zone_id": zone["_id"],
-                    "timestamp": {"$gte": start_date, "$lt": end_date}
-                })
+            # Calculate risk level
+            violation_rate = (violation_count / total_entries * 100) if total_entries > 0 else 0
+            risk_level = "low" if violation_rate < 10 else "medium" if violation_rate < 25 else "high"
 
-                # Calculate risk level
-                violation_rate = (violation_count / total_entries * 100) if total_entries > 0 else 0
-                risk_level = "low" if violation_rate < 10 else "medium" if violation_rate < 25 else "high"
-
-                heatmap_data.append({
-                    "mine_id": mine_id,
-                    "zone_id": zone_id,
-                    "zone_name": zone.get("name"),
-                    "violation_count": violation_count,
-                    "total_entries": total_entries,
-                    "violation_rate": round(violation_rate, 1),
-                    "risk_level": risk_level
-                })
+            heatmap_data.append({
+                "mine_id": mine_id,
+                "zone_id": str(zone["_id"]),
+                "zone_name": zone.get("name"),
+                "violation_count": violation_count,
+                "total_entries": total_entries,
+                "violation_rate": round(violation_rate, 1),
+                "risk_level": risk_level
+            })
 
         return heatmap_data
 
@@ -428,24 +789,26 @@ class DataAggregator:
             "created_at": {"$gte": start_date, "$lt": end_date}
         }
         if mine_ids:
-            query["mine_id"] = {"$in": [ObjectId(m) for m in mine_ids]}
-
-        alerts = await self.db.alerts.find(query).sort("created_at", -1).to_list(length=100)
-
-        incidents = []
-        for alert in alerts:
-            mine_info = await self.db.mines.find_one({"_id": alert.get("mine_id")})
-            incidents.append({
-                "id": str(alert["_id"]),
-                "type": alert.get("alert_type"),
-                "severity": alert.get("severity"),
-                "message": alert.get("message"),
-                "mine_name": mine_info.get("name") if mine_info else "Unknown",
-                "status": alert.get("status"),
-                "created_at": alert.get("created_at")
-            })
+            query["mine_id"] = {"$in": [_object_id(m) for m in mine_ids]}
+
+        # Latest alerts with their mine names joined on the server
+        alerts = await self.db.alerts.aggregate([
+            {"$match": query},
+            *_CRITICAL_INCIDENT_STAGES
+        ]).to_list(length=100)
 
-        return incidents
+        return [
+            {
+                "id": str(a["_id"]),
+                "type": a.get("alert_type"),
+                "severity": a.get("severity"),
+                "message": a.get("message"),
+                "mine_name": a.get("mine_name") or "Unknown",
+                "status": a.get("status"),
+                "created_at": a.get("created_at")
+            }
+            for a in alerts
+        ]
 
     # ==================== General Manager Data ====================
 
@@ -455,20 +818,14 @@ class DataAggregator:
         end_date: datetime
     ) -> Dict[str, Any]:
         """Get executive summary data for general manager."""
-        # Get all mines
-        mines = await self.db.mines.find({"is_active": True}).to_list(length=None)
+        # All mines, organization-wide worker count and entries, fetched concurrently
+        mines, total_workers, (total, compliant, total_violations) = await asyncio.gather(
+            self.db.mines.find({"is_active": True}, {"_id": 1}).to_list(length=None),
+            self.db.workers.count_documents({"is_active": True}),
+            self._count_entries(start_date, end_date)
+        )
         mine_ids = [str(m["_id"]) for m in mines]
 
-        # Organization-wide metrics
-        total_workers = await self.db.workers.count_documents({"is_active": True})
-
-        # Aggregate compliance across all mines
-        all_entries = await self.db.gate_entries.find({
-            "timestamp": {"$gte": start_date, "$lt": end_date}
-        }).to_list(length=None)
-
-        total = len(all_entries)
-        compliant = len([e for e in all_entries if e.get("ppe_compliant", False)])
         org_compliance = (compliant / total * 100) if total > 0 else 0
 
         # KPIs
@@ -477,11 +834,14 @@ class DataAggregator:
             "total_workers": total_workers,
             "total_entries": total,
             "overall_compliance": round(org_compliance, 1),
-            "total_violations": sum(len(e.get("violations", [])) for e in all_entries)
+            "total_violations": total_violations
         }
 
-        # Mine performance
-        mine_comparison = await self.get_mine_comparison(mine_ids, start_date, end_date)
+        # Mine performance and strategic alerts both need the mine list
+        mine_comparison, critical_incidents = await asyncio.gather(
+            self.get_mine_comparison(mine_ids, start_date, end_date),
+            self.get_critical_incidents(mine_ids, start_date, end_date)
+        )
 
         # Regulatory status
         regulatory_threshold = 85  # Example threshold
@@ -491,9 +851,6 @@ class DataAggregator:
             "status": "compliant" if org_compliance >= regulatory_threshold else "needs_attention"
         }
 
-        # Strategic alerts
-        critical_incidents = await self.get_critical_incidents(mine_ids, start_date, end_date)
-
         return {
             "kpis": kpis,
             "mine_performance": mine_comparison["mines"],
@@ -513,18 +870,18 @@ class DataAggregator:
         COST_PER_INCIDENT = 5000  # Average cost per safety incident
         COST_PER_VIOLATION = 100  # Administrative cost per violation
 
-        # Count prevented incidents (violations caught at gate)
-        violations_caught = await self.db.gate_entries.count_documents({
-            "violations": {"$exists": True, "$ne": []},
-            "status": "denied",  # Entry was denied due to violations
-            "timestamp": {"$gte": start_date, "$lt": end_date}
-        })
-
-        # Total violations
-        all_violations = await self.db.gate_entries.count_documents({
-            "violations": {"$exists": True, "$ne": []},
-            "timestamp": {"$gte": start_date, "$lt": end_date}
-        })
+        # Violations caught at the gate (entry denied) and total violations
+        violations_caught, all_violations = await asyncio.gather(
+            self.db.gate_entries.count_documents({
+                "violations": {"$exists": True, "$ne": []},
+                "status": "denied",  # Entry was denied due to violations
+                "timestamp": {"$gte": start_date, "$lt": end_date}
+            }),
+            self.db.gate_entries.count_documents({
+                "violations": {"$exists": True, "$ne": []},
+                "timestamp": {"$gte": start_date, "$lt": end_date}
+            })
+        )
 
         # Estimate savings
         incidents_prevented = violations_caught * 0.1  # Assume 10% could have been incidents
@@ -545,23 +902,26 @@ class DataAggregator:
         worker_id: str
     ) -> Dict[str, Any]:
         """Get compliance card data for a worker."""
-        worker = await self.db.workers.find_one({"_id": ObjectId(worker_id)})
+        worker_oid = _object_id(worker_id)
+
+        # Worker profile, recent violations (last 30 days), streak and
+        # attendance are independent, so they are fetched concurrently
+        worker, recent_violations, streak, attendance = await asyncio.gather(
+            self.db.workers.find_one({"_id": worker_oid}, {
+                "employee_id": 1, "name": 1, "department": 1, "assigned_shift": 1,
+                "compliance_score": 1, "total_violations": 1, "badges": 1
+            }),
+            self.db.gate_entries.find({
+                "worker_id": worker_oid,
+                "violations": {"$exists": True, "$ne": []},
+                "timestamp": {"$gte": datetime.utcnow() - timedelta(days=30)}
+            }, _ENTRY_LOG_PROJECTION).sort("timestamp", -1).to_list(length=10),
+            self._calculate_compliance_streak(worker_id),
+            self._get_worker_attendance(worker_id)
+        )
         if not worker:
             return {}
 
-        # Get recent violations (last 30 days)
-        recent_violations = await self.db.gate_entries.find({
-            "worker_id": ObjectId(worker_id),
-            "violations": {"$exists": True, "$ne": []},
-            "timestamp": {"$gte": datetime.utcnow() - timedelta(days=30)}
-        }).sort("timestamp", -1).to_list(length=10)
-
-        # Calculate streak (consecutive days without violations)
-        streak = await self._calculate_compliance_streak(worker_id)
-
-        # Get attendance summary
-        attendance = await self._get_worker_attendance(worker_id)
-
         return {
             "worker_info": {
                 "id": str(worker["_id"]),
@@ -578,23 +938,146 @@ class DataAggregator:
             "attendance_summary": attendance
         }
 
+    # ==================== Daily Rollups ====================
+
+    async def refresh_daily_rollups(self) -> Optional[datetime]:
+        """
+        Roll up gate entries for every complete UTC day not yet covered.
+
+        The last ROLLUP_REFRESH_DAYS already covered are rebuilt as well, so
+        entries written after their day was rolled up are picked up. Each
+        day in the window is deleted and rolled up again, which also drops
+        zones and violation types that no longer have entries. The covered
+        range is recorded in rollup_status.
+
+        Returns:
+            End of the covered range, or None if nothing needed rolling up
+        """
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        status = await self.db.rollup_status.find_one({"_id": "gate_entries"})
+        if status:
+            start = max(status["from"], min(status["through"], today) - timedelta(days=ROLLUP_REFRESH_DAYS))
+        else:
+            start = today - timedelta(days=ROLLUP_BACKFILL_DAYS)
+        if start >= today:
+            return None
+
+        # Reports read the window from gate_entries while it is rebuilt
+        await self.db.rollup_status.update_one(
+            {"_id": "gate_entries"},
+            {"$set": {"through": start}, "$setOnInsert": {"from": start}},
+            upsert=True
+        )
+
+        window = {"$gte": start, "$lt": today}
+        await asyncio.gather(
+            self.db.daily_rollups.delete_many({"date": window}),
+            self.db.daily_violation_rollups.delete_many({"date": window})
+        )
+
+        match = {"$match": {"timestamp": window}}
+        await self.db.gate_entries.aggregate([match, *_DAILY_ROLLUP_STAGES]).to_list(length=None)
+        await self.db.gate_entries.aggregate([match, *_DAILY_VIOLATION_ROLLUP_STAGES]).to_list(length=None)
+
+        await self.db.rollup_status.update_one(
+            {"_id": "gate_entries"},
+            {"$set": {"through": today}}
+        )
+
+        return today
+
+    async def reset_daily_rollups(self) -> Optional[datetime]:
+        """
+        Discard the daily rollups and rebuild them from gate_entries.
+
+        Use after bulk writes to old gate entries (seeding, purges,
+        backfills) that the trailing refresh window would not reach.
+
+        Returns:
+            End of the rebuilt range
+        """
+        await self.db.rollup_status.delete_one({"_id": "gate_entries"})
+        await asyncio.gather(
+            self.db.daily_rollups.delete_many({}),
+            self.db.daily_violation_rollups.delete_many({})
+        )
+        return await self.refresh_daily_rollups()
+
+    async def _rollups_cover(self, start_date: datetime, end_date: datetime) -> bool:
+        """Check whether the daily rollups hold every day in [start_date, end_date)."""
+        midnight = {"hour": 0, "minute": 0, "second": 0, "microsecond": 0}
+        if start_date != start_date.replace(**midnight) or end_date != end_date.replace(**midnight):
+            return False
+
+        status = await self.db.rollup_status.find_one({"_id": "gate_entries"})
+        return bool(status) and status["from"] <= start_date and end_date <= status["through"]
+
+    async def _get_compliance_facets(
+        self,
+        mine_id: Optional[str],
+        start_date: datetime,
+        end_date: datetime,
+        period: str
+    ) -> Dict[str, List[Dict]]:
+        """Get totals, trend buckets, violation types and zones in one round-trip."""
+        # Read from the daily rollups when they cover the whole range
+        if await self._rollups_cover(start_date, end_date):
+            return await self._get_rollup_facets(mine_id, start_date, end_date, period)
+
+        query = {"timestamp": {"$gte": start_date, "$lt": end_date}}
+        if mine_id:
+            query["mine_id"] = _object_id(mine_id)
+
+        pipeline = [{"$match": query}, {"$facet": _COMPLIANCE_FACETS_BY_PERIOD[period]}]
+        return (await self.db.gate_entries.aggregate(pipeline).to_list(length=1))[0]
+
+    async def _get_rollup_facets(
+        self,
+        mine_id: Optional[str],
+        start_date: datetime,
+        end_date: datetime,
+        period: str = "day"
+    ) -> Dict[str, List[Dict]]:
+        """Get the compliance facets from the daily rollup collections."""
+        query = {"date": {"$gte": start_date, "$lt": end_date}}
+        if mine_id:
+            query["mine_id"] = _object_id(mine_id)
+
+        pipeline = [{"$match": query}, {"$facet": _ROLLUP_COMPLIANCE_FACETS_BY_PERIOD[period]}]
+        facets, violations_by_type = await asyncio.gather(
+            self.db.daily_rollups.aggregate(pipeline).to_list(length=1),
+            self.db.daily_violation_rollups.aggregate([
+                {"$match": query},
+                {"$group": {"_id": "$type", "count": {"$sum": "$count"}}},
+                {"$sort": {"count": -1}}
+            ]).to_list(length=None)
+        )
+
+        facets = facets[0]
+        facets["violations_by_type"] = violations_by_type
+        return facets
+
     # ==================== Helper Methods ====================
 
-    async def _get_hourly_breakdown(
+    async def _gather_per_mine(self, coros) -> List[Any]:
+        """Await per-mine coroutines concurrently, at most MINE_FANOUT_LIMIT at a time."""
+        semaphore = asyncio.Semaphore(MINE_FANOUT_LIMIT)
+
+        async def run(coro):
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(*(run(c) for c in coros))
+
+    def _get_hourly_breakdown(
         self,
-        entries: List[Dict],
+        hour_buckets: List[Dict],
         start_time: datetime,
         end_time: datetime
     ) -> List[Dict[str, Any]]:
-        """Group entries by hour."""
-        from collections import defaultdict
-        hourly = defaultdict(lambda: {"entries": 0, "violations": 0, "compliance_rate": 0})
-
-        for entry in entries:
-            hour = entry.get("timestamp").hour
-            hourly[hour]["entries"] += 1
-            if entry.get("violations"):
-                hourly[hour]["violations"] += len(entry.get("violations", []))
+        """Lay out per-hour entry and violation counts over the shift."""
+        hourly = {b["_id"]: b for b in hour_buckets}
 
         result = []
         current = start_time
@@ -620,81 +1103,52 @@ class DataAggregator:
         # This is a simplified version - real implementation would track entry/exit pairs
         pipeline = [
             {"$match": {
-                "mine_id": ObjectId(mine_id) if mine_id else {"$exists": True},
+                "mine_id": _mine_match(mine_id),
                 "timestamp": {"$lt": as_of}
             }},
-            {"$sort": {"timestamp": -1}},
-            {"$group": {
-                "_id": "$worker_id",
-                "last_entry_type": {"$first": "$entry_type"}
-            }},
-            {"$match": {"last_entry_type": "entry"}}
+            _WORKERS_INSIDE_MINE_SORT if mine_id else _WORKERS_INSIDE_ALL_SORT,
+            *_WORKERS_INSIDE_STAGES
         ]
 
-        result = await self.db.gate_entries.aggregate(pipeline).to_list(length=None)
-        return len(result)
+        options = {"hint": _WORKERS_INSIDE_INDEX} if mine_id else {}
+        result = await self.db.gate_entries.aggregate(
+            pipeline, allowDiskUse=True, **options
+        ).to_list(length=1)
+        return result[0]["n"] if result else 0
 
-    async def _get_compliance_trend(
+    def _get_compliance_trend(
         self,
-        entries: List[Dict],
-        group_by: str
+        buckets: List[Dict],
+        period: str
     ) -> List[Dict[str, Any]]:
-        """Calculate compliance trend over time."""
-        from collections import defaultdict
-
-        grouped = defaultdict(lambda: {"total": 0, "compliant": 0})
-
-        for entry in entries:
-            ts = entry.get("timestamp")
-            if group_by == "day":
-                key = ts.strftime("%Y-%m-%d")
-            elif group_by == "week":
-                key = ts.strftime("%Y-W%W")
-            else:
-                key = ts.strftime("%Y-%m")
-
-            grouped[key]["total"] += 1
-            if entry.get("ppe_compliant", False):
-                grouped[key]["compliant"] += 1
+        """Format compliance trend rows from per-period totals, oldest first."""
+        label_format = _TREND_PERIODS[period][1]
 
         result = []
-        for date_key in sorted(grouped.keys()):
-            data = grouped[date_key]
-            compliance = (data["compliant"] / data["total"] * 100) if data["total"] > 0 else 0
+        for bucket in buckets:
+            compliance = (bucket["compliant"] / bucket["total"] * 100) if bucket["total"] > 0 else 0
             result.append({
-                "date": date_key,
-                "total_entries": data["total"],
-                "compliant_entries": data["compliant"],
+                "date": bucket["_id"].strftime(label_format),
+                "total_entries": bucket["total"],
+                "compliant_entries": bucket["compliant"],
                 "compliance_rate": round(compliance, 1)
             })
 
         return result
 
-    async def _get_zone_analysis(
-        self,
-        mine_id: str,
-        start_date: datetime,
-        end_date: datetime
-    ) -> List[Dict[str, Any]]:
-        """Get zone-level violation analysis."""
-        query = {"timestamp": {"$gte": start_date, "$lt": end_date}}
-        if mine_id:
-            query["mine_id"] = ObjectId(mine_id)
-
-        pipeline = [
-            {"$match": query},
-            {"$group": {
-                "_id": "$zone_id",
-                "total_entries": {"$sum": 1},
-                "violations": {"$sum": {"$cond": [{"$gt": [{"$size": {"$ifNull": ["$violations", []]}}, 0]}, 1, 0]}}
-            }}
-        ]
-
-        results = await self.db.gate_entries.aggregate(pipeline).to_list(length=None)
+    async def _format_zone_analysis(self, results: List[Dict]) -> List[Dict[str, Any]]:
+        """Build zone-level violation analysis from per-zone entry counts."""
+        # All zone documents in one query
+        zones = {
+            z["_id"]: z
+            for z in await self.db.zones.find(
+                {"_id": {"$in": [r["_id"] for r in results]}}, _NAME_PROJECTION
+            ).to_list(length=None)
+        }
 
         zone_analysis = []
         for r in results:
-            zone = await self.db.zones.find_one({"_id": r["_id"]})
+            zone = zones.get(r["_id"])
             violation_rate = (r["violations"] / r["total_entries"] * 100) if r["total_entries"] > 0 else 0
 
             zone_analysis.append({
@@ -708,6 +1162,27 @@ class DataAggregator:
 
         return sorted(zone_analysis, key=lambda x: x["violation_rate"], reverse=True)
 
+    async def _count_entries(self, start_date: datetime, end_date: datetime) -> Tuple[int, int, int]:
+        """
+        Count entries, compliant entries and violations across all mines.
+
+        The cursor is consumed batch by batch, so memory stays flat however
+        many entries the period holds.
+        """
+        cursor = self.db.gate_entries.find(
+            {"timestamp": {"$gte": start_date, "$lt": end_date}},
+            {"_id": 0, "ppe_compliant": 1, "violations": 1}
+        ).batch_size(SCAN_BATCH_SIZE)
+
+        total = compliant = violations = 0
+        async for entry in cursor:
+            total += 1
+            if entry.get("ppe_compliant", False):
+                compliant += 1
+            violations += len(entry.get("violations", []))
+
+        return total, compliant, violations
+
     async def _count_violations(
         self,
         mine_id: str,
@@ -720,25 +1195,15 @@ class DataAggregator:
             "timestamp": {"$gte": start_date, "$lt": end_date}
         }
         if mine_id:
-            query["mine_id"] = ObjectId(mine_id)
-
-        entries = await self.db.gate_entries.find(query).to_list(length=None)
-
-        by_type = {}
-        for entry in entries:
-            for v in entry.get("violations", []):
-                # Handle both string violations and dict violations
-                if isinstance(v, str):
-                    v_type = v
-                elif isinstance(v, dict):
-                    v_type = v.get("type", "unknown")
-                else:
-                    v_type = str(v)
-                by_type[v_type] = by_type.get(v_type, 0) + 1
+            query["mine_id"] = _object_id(mine_id)
+
+        # Entry count and per-type counts from one scan
+        pipeline = [{"$match": query}, {"$facet": _VIOLATION_COUNT_FACETS}]
+        facets = (await self.db.gate_entries.aggregate(pipeline).to_list(length=1))[0]
 
         return {
-            "total": len(entries),
-            "by_type": by_type,
+            "total": facets["total"][0]["n"] if facets["total"] else 0,
+            "by_type": {r["_id"]: r["count"] for r in facets["by_type"]},
             "period": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
         }
 
@@ -755,24 +1220,32 @@ class DataAggregator:
             "timestamp": {"$gte": start_date, "$lt": end_date}
         }
         if mine_id:
-            query["mine_id"] = ObjectId(mine_id)
+            query["mine_id"] = _object_id(mine_id)
 
         pipeline = [
             {"$match": query},
-            {"$group": {
-                "_id": "$worker_id",
-                "violation_count": {"$sum": 1}
-            }},
+            _REPEAT_OFFENDERS_GROUP,
             {"$match": {"violation_count": {"$gte": threshold}}},
             {"$sort": {"violation_count": -1}},
             {"$limit": 20}
         ]
 
-        results = await self.db.gate_entries.aggregate(pipeline).to_list(length=None)
+        # Scan the mine's time range from its index rather than letting the
+        # planner pick the broader timestamp index
+        options = {"hint": [("mine_id", 1), ("timestamp", -1)]} if mine_id else {}
+        results = await self.db.gate_entries.aggregate(pipeline, **options).to_list(length=None)
+
+        # All offending workers in one query
+        workers = {
+            w["_id"]: w
+            for w in await self.db.workers.find(
+                {"_id": {"$in": [r["_id"] for r in results]}}, {"employee_id": 1, "name": 1}
+            ).to_list(length=None)
+        }
 
         offenders = []
         for r in results:
-            worker = await self.db.workers.find_one({"_id": r["_id"]})
+            worker = workers.get(r["_id"])
             if worker:
                 offenders.append({
                     "worker_id": str(r["_id"]),
@@ -791,19 +1264,27 @@ class DataAggregator:
     ) -> Dict[str, Any]:
         """Get performance comparison by shift."""
         shifts = ["day", "afternoon", "night"]
-        performance = {}
+        query = {
+            "shift": {"$in": shifts},
+            "timestamp": {"$gte": start_date, "$lt": end_date}
+        }
+        if mine_id:
+            query["mine_id"] = _object_id(mine_id)
+
+        # Every shift's totals from one scan of the range
+        counts = {
+            r["_id"]: r
+            for r in await self.db.gate_entries.aggregate([
+                {"$match": query},
+                {"$group": {"_id": "$shift", "total": {"$sum": 1}, "compliant": _COMPLIANT_SUM}}
+            ]).to_list(length=None)
+        }
 
+        performance = {}
         for shift in shifts:
-            query = {
-                "shift": shift,
-                "timestamp": {"$gte": start_date, "$lt": end_date}
-            }
-            if mine_id:
-                query["mine_id"] = ObjectId(mine_id)
-
-            entries = await self.db.gate_entries.find(query).to_list(length=None)
-            total = len(entries)
-            compliant = len([e for e in entries if e.get("ppe_compliant", False)])
+            r = counts.get(shift, {"total": 0, "compliant": 0})
+            total = r["total"]
+            compliant = r["compliant"]
 
             performance[shift] = {
                 "total_entries": total,
@@ -821,13 +1302,13 @@ class DataAggregator:
         """Get top and bottom performing workers."""
         query = {"is_active": True}
         if mine_id:
-            query["mine_id"] = ObjectId(mine_id)
+            query["mine_id"] = _object_id(mine_id)
 
-        # Top performers
-        top = await self.db.workers.find(query).sort("compliance_score", -1).limit(limit).to_list(length=limit)
-
-        # Bottom performers
-        bottom = await self.db.workers.find(query).sort("compliance_score", 1).limit(limit).to_list(length=limit)
+        # Top and bottom performers, each read off the score index, fetched concurrently
+        top, bottom = await asyncio.gather(
+            self.db.workers.find(query, _RANKING_PROJECTION).sort("compliance_score", -1).limit(limit).to_list(length=limit),
+            self.db.workers.find(query, _RANKING_PROJECTION).sort("compliance_score", 1).limit(limit).to_list(length=limit)
+        )
 
         return {
             "top_performers": [
@@ -860,9 +1341,9 @@ class DataAggregator:
             "created_at": {"$gte": start_date, "$lt": end_date}
         }
         if mine_id:
-            query["mine_id"] = ObjectId(mine_id)
+            query["mine_id"] = _object_id(mine_id)
 
-        alerts = await self.db.alerts.find(query).sort("created_at", -1).to_list(length=50)
+        alerts = await self.db.alerts.find(query, _ALERT_PROJECTION).sort("created_at", -1).to_list(length=50)
 
         return [
             {
@@ -878,52 +1359,37 @@ class DataAggregator:
 
     async def _calculate_compliance_streak(self, worker_id: str) -> int:
         """Calculate consecutive days without violations."""
-        # Get entries sorted by date descending
-        entries = await self.db.gate_entries.find({
-            "worker_id": ObjectId(worker_id)
-        }).sort("timestamp", -1).limit(90).to_list(length=90)
-
-        if not entries:
-            return 0
-
-        streak = 0
-        current_date = None
-
-        for entry in entries:
-            entry_date = entry["timestamp"].date()
-
-            if current_date is None:
-                current_date = entry_date
-
-            if entry_date != current_date:
-                if (current_date - entry_date).days > 1:
-                    break
-                current_date = entry_date
-
-            if entry.get("violations"):
-                break
-
-            streak += 1
-
-        return streak
+        # Walk the latest 90 entries day by day on the server; only the
+        # streak length comes back
+        pipeline = [
+            {"$match": {"worker_id": _object_id(worker_id)}},
+            *_COMPLIANCE_STREAK_STAGES
+        ]
+        result = await self.db.gate_entries.aggregate(pipeline).to_list(length=1)
+        return result[0]["streak"] if result else 0
 
     async def _get_worker_attendance(self, worker_id: str) -> Dict[str, Any]:
         """Get worker attendance summary."""
         # Last 30 days
         start = datetime.utcnow() - timedelta(days=30)
 
-        entries = await self.db.gate_entries.find({
-            "worker_id": ObjectId(worker_id),
-            "entry_type": "entry",
-            "timestamp": {"$gte": start}
-        }).to_list(length=None)
+        # Entry count and distinct days worked in one aggregation
+        pipeline = [
+            {"$match": {
+                "worker_id": _object_id(worker_id),
+                "entry_type": "entry",
+                "timestamp": {"$gte": start}
+            }},
+            {"$facet": _ATTENDANCE_FACETS}
+        ]
+        facets = (await self.db.gate_entries.aggregate(pipeline).to_list(length=1))[0]
 
-        # Count unique days
-        unique_days = len(set(e["timestamp"].date() for e in entries))
+        total_entries = facets["entries"][0]["n"] if facets["entries"] else 0
+        unique_days = facets["days"][0]["n"] if facets["days"] else 0
 
         return {
             "days_worked_last_30": unique_days,
-            "total_entries_last_30": len(entries),
+            "total_entries_last_30": total_entries,
             "attendance_rate": round((unique_days / 30) * 100, 1)
         }
 
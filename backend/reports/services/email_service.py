@@ -5,18 +5,32 @@ Uses aiosmtplib for async email sending with attachment support.
 """
 
 import os
+import re
+import asyncio
+import base64
+import logging
 import aiosmtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
+from email.mime.application import MIMEApplication
 from email import encoders
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 from io import BytesIO
 from jinja2 import Environment, BaseLoader
 
 from ..schemas import EmailRecipient
 
+logger = logging.getLogger(__name__)
+
+# 57 raw bytes encode to exactly one 76-character base64 line
+_BASE64_CHUNK = 57 * 1024
+
+
+def _minify_html(html: str) -> str:
+    """Collapse whitespace runs and drop whitespace between tags."""
+    return re.sub(r">\s+<", "><", re.sub(r"\s{2,}", " ", html)).strip()
+
 
 class EmailService:
     """
@@ -157,6 +171,23 @@ class EmailService:
     </body>
     </html>
     """
+    EMAIL_TEMPLATE = _minify_html(EMAIL_TEMPLATE)
+
+    # Metric color names to hex
+    COLOR_MAP = {
+        "green": "#22c55e",
+        "red": "#ef4444",
+        "orange": "#f59e0b",
+        "blue": "#3b82f6",
+        "gray": "#6b7280",
+        "primary": "#fb923c"
+    }
+
+    # Attachment MIME subtypes by file extension
+    ATTACHMENT_SUBTYPES = {
+        "pdf": "pdf",
+        "xlsx": "vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    }
 
     def __init__(self):
         """Initialize email service with configuration from environment."""
@@ -166,16 +197,29 @@ class EmailService:
         self.smtp_password = os.getenv("SMTP_PASSWORD", "")
         self.from_email = os.getenv("FROM_EMAIL", "reports@minesafety.com")
         self.from_name = os.getenv("FROM_NAME", "Mine Safety Reports")
+        self.smtp_pool_size = max(1, int(os.getenv("SMTP_POOL_SIZE", "3")))
 
         # Log configuration (without password)
-        print(f"[EmailService] Initialized with:")
-        print(f"  - SMTP Host: {self.smtp_host}:{self.smtp_port}")
-        print(f"  - SMTP User: {self.smtp_user if self.smtp_user else 'NOT CONFIGURED'}")
-        print(f"  - SMTP Password: {'***' if self.smtp_password else 'NOT CONFIGURED'}")
-        print(f"  - From: {self.from_name} <{self.from_email}>")
+        logger.info(
+            "Initialized with SMTP host %s:%s, user %s, password %s, from %s <%s>",
+            self.smtp_host,
+            self.smtp_port,
+            self.smtp_user or "NOT CONFIGURED",
+            "***" if self.smtp_password else "NOT CONFIGURED",
+            self.from_name,
+            self.from_email
+        )
 
-        # Initialize Jinja2 environment
+        # Initialize Jinja2 environment and compile the email template once
         self.jinja_env = Environment(loader=BaseLoader())
+        self._email_template = self.jinja_env.from_string(self.EMAIL_TEMPLATE)
+
+        # Pool of persistent SMTP connections. SMTP is sequential per
+        # connection, so each send checks one out; slots start empty and
+        # are connected on first use.
+        self._pool: asyncio.Queue = asyncio.Queue()
+        for _ in range(self.smtp_pool_size):
+            self._pool.put_nowait(None)
 
     async def send_report(
         self,
@@ -201,63 +245,122 @@ class EmailService:
             True if email sent successfully, False otherwise
         """
         if not self.smtp_user or not self.smtp_password:
-            print("[EmailService] Warning: SMTP credentials not configured. Email not sent.")
-            print(f"[EmailService] SMTP_USER: {self.smtp_user}, SMTP_PASSWORD: {'set' if self.smtp_password else 'not set'}")
+            logger.warning(
+                "SMTP credentials not configured. Email not sent. SMTP_USER: %s, SMTP_PASSWORD: %s",
+                self.smtp_user,
+                "set" if self.smtp_password else "not set"
+            )
             return False
 
-        print(f"[EmailService] Sending report '{report_name}' to {len(recipients)} recipients...")
+        logger.info("Sending report '%s' to %d recipients...", report_name, len(recipients))
 
         try:
-            # Create message
-            message = MIMEMultipart()
-            message["From"] = f"{self.from_name} <{self.from_email}>"
-            message["Subject"] = f"[Report] {report_name} - {date_range}"
-
-            # Set recipients
-            to_recipients = [r.email for r in recipients if r.type == "to"]
-            cc_recipients = [r.email for r in recipients if r.type == "cc"]
-            bcc_recipients = [r.email for r in recipients if r.type == "bcc"]
-
-            message["To"] = ", ".join(to_recipients)
-            if cc_recipients:
-                message["Cc"] = ", ".join(cc_recipients)
-
-            # Render HTML body
-            html_body = self._render_email_body(
-                report_name=report_name,
-                date_range=date_range,
-                summary_metrics=summary_metrics or [],
-                highlights=highlights or [],
-                format=attachments[0].get("format", "PDF") if attachments else "PDF"
+            # Rendering and base64-encoding attachments is CPU-bound; keep it off the event loop
+            message, all_recipients = await asyncio.get_running_loop().run_in_executor(
+                None,
+                self._build_report_message,
+                recipients,
+                report_name,
+                date_range,
+                attachments,
+                summary_metrics or [],
+                highlights or []
             )
 
-            # Attach HTML body
-            message.attach(MIMEText(html_body, "html"))
-
-            # Attach files
-            for attachment in attachments:
-                self._attach_file(message, attachment)
-
             # Send email
-            all_recipients = to_recipients + cc_recipients + bcc_recipients
-
-            await aiosmtplib.send(
-                message,
-                hostname=self.smtp_host,
-                port=self.smtp_port,
-                username=self.smtp_user,
-                password=self.smtp_password,
-                start_tls=True,
-                recipients=all_recipients
-            )
+            await self._send_message(message, recipients=all_recipients)
 
-            print(f"Report email sent successfully to {len(all_recipients)} recipients")
+            logger.info("Report email sent successfully to %d recipients", len(all_recipients))
             return True
 
         except Exception as e:
-            print(f"Error sending email: {e}")
+            logger.error("Error sending email: %s", e)
             return False
 
+    def _build_report_message(
+        self,
+        recipients: List[EmailRecipient],
+        report_name: str,
+        date_range: str,
+        attachments: List[dict],
+        summary_metrics: List[dict],
+        highlights: List[str]
+    ) -> Tuple[MIMEMultipart, List[str]]:
+        """Assemble the report MIME message and its envelope recipients."""
+        message = MIMEMultipart()
+        message["From"] = f"{self.from_name} <{self.from_email}>"
+        message["Subject"] = f"[Report] {report_name} - {date_range}"
+
+        # Set recipients
+        to_recipients, cc_recipients, bcc_recipients = [], [], []
+        buckets = {"to": to_recipients, "cc": cc_recipients, "bcc": bcc_recipients}
+        for r in recipients:
+            bucket = buckets.get(r.type)
+            if bucket is not None:
+                bucket.append(r.email)
+
+        message["To"] = ", ".join(to_recipients)
+        if cc_recipients:
+            message["Cc"] = ", ".join(cc_recipients)
+
+        # Render HTML body
+        html_body = self._render_email_body(
+            report_name=report_name,
+            date_range=date_range,
+            summary_metrics=summary_metrics,
+            highlights=highlights,
+            format=attachments[0].get("format", "PDF") if attachments else "PDF"
+        )
+
+        # Attach HTML body
+        message.attach(MIMEText(html_body, "html"))
+
+        # Attach files
+        for attachment in attachments:
+            self._attach_file(message, attachment)
+
+        return message, to_recipients + cc_recipients + bcc_recipients
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        """Open and authenticate a new SMTP connection."""
+        client = aiosmtplib.SMTP(
+            hostname=self.smtp_host,
+            port=self.smtp_port,
+            start_tls=True
+        )
+        await client.connect()
+        await client.login(self.smtp_user, self.smtp_password)
+        return client
+
+    async def _send_message(self, message: MIMEMultipart, recipients: Optional[List[str]] = None):
+        """Send a message over a pooled connection, reconnecting once if it was dropped."""
+        client = await self._pool.get()
+        try:
+            if client is None or not client.is_connected:
+                client = None
+                client = await self._connect()
+            try:
+                await client.send_message(message, recipients=recipients)
+            except aiosmtplib.SMTPServerDisconnected:
+                # Servers close idle connections; reconnect and retry once
+                client = None
+                client = await self._connect()
+                await client.send_message(message, recipients=recipients)
+        finally:
+            self._pool.put_nowait(client)
+
+    async def close(self):
+        """Close the pooled SMTP connections."""
+        for _ in range(self.smtp_pool_size):
+            client = await self._pool.get()
+            if client is not None and client.is_connected:
+                try:
+                    await client.quit()
+                except aiosmtplib.SMTPException:
+                    client.close()
+        for _ in range(self.smtp_pool_size):
+            self._pool.put_nowait(None)
+
     def _render_email_body(
         self,
         report_name: str,
@@ -267,27 +370,16 @@ class EmailService:
         format: str
     ) -> str:
         """Render the HTML email body using Jinja2."""
-        template = self.jinja_env.from_string(self.EMAIL_TEMPLATE)
-
-        # Map color names to hex
-        color_map = {
-            "green": "#22c55e",
-            "red": "#ef4444",
-            "orange": "#f59e0b",
-            "blue": "#3b82f6",
-            "gray": "#6b7280",
-            "primary": "#fb923c"
-        }
-
-        # Process metrics colors
+        # Resolve metric colors on copies; the caller's dicts are left untouched
+        rendered_metrics = []
         for metric in summary_metrics:
             color = metric.get("color", "primary")
-            metric["color"] = color_map.get(color, color)
+            rendered_metrics.append({**metric, "color": self.COLOR_MAP.get(color, color)})
 
-        return template.render(
+        return self._email_template.render(
             report_name=report_name,
             date_range=date_range,
-            summary_metrics=summary_metrics,
+            summary_metrics=rendered_metrics,
             highlights=highlights,
             format=format.upper(),
             generated_at=datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
@@ -299,28 +391,35 @@ class EmailService:
         data = attachment.get("data")
         content_type = attachment.get("content_type", "application/octet-stream")
 
-        if isinstance(data, BytesIO):
-            data = data.getvalue()
+        # Determine MIME subtype from the extension, falling back to the content type
+        subtype = self.ATTACHMENT_SUBTYPES.get(filename.rsplit(".", 1)[-1].lower())
+        if subtype is None:
+            maintype, _, subtype = content_type.partition("/")
+            if maintype != "application" or not subtype:
+                subtype = "octet-stream"
 
-        # Determine MIME type
-        if content_type == "application/pdf" or filename.endswith(".pdf"):
-            maintype, subtype = "application", "pdf"
-        elif content_type == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" or filename.endswith(".xlsx"):
-            maintype, subtype = "application", "vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        # The payload is already base64, so MIMEApplication must not encode it again
+        if isinstance(data, BytesIO):
+            with data.getbuffer() as view:
+                encoded = self._encode_base64(view)
         else:
-            maintype, subtype = content_type.split("/", 1) if "/" in content_type else ("application", "octet-stream")
+            encoded = self._encode_base64(data)
+        part = MIMEApplication(encoded, _subtype=subtype, _encoder=encoders.encode_noop)
+        part["Content-Transfer-Encoding"] = "base64"
 
-        part = MIMEBase(maintype, subtype)
-        part.set_payload(data)
-        encoders.encode_base64(part)
-
-        part.add_header(
-            "Content-Disposition",
-            f"attachment; filename={filename}"
-        )
+        part.add_header("Content-Disposition", "attachment", filename=filename)
 
         message.attach(part)
 
+    @staticmethod
+    def _encode_base64(data) -> str:
+        """Base64-encode an attachment in line-aligned chunks without copying the source."""
+        view = memoryview(data)
+        return "".join(
+            base64.encodebytes(view[i:i + _BASE64_CHUNK]).decode("ascii")
+            for i in range(0, len(view), _BASE64_CHUNK)
+        )
+
     async def send_test_email(self, recipient_email: str) -> bool:
         """
         Send a test email to verify configuration.
@@ -354,19 +453,12 @@ class EmailService:
 
             message.attach(MIMEText(body, "html"))
 
-            await aiosmtplib.send(
-                message,
-                hostname=self.smtp_host,
-                port=self.smtp_port,
-                username=self.smtp_user,
-                password=self.smtp_password,
-                start_tls=True
-            )
+            await self._send_message(message)
 
             return True
 
         except Exception as e:
-            print(f"Test email failed: {e}")
+            logger.error("Test email failed: %s", e)
             return False
 
 
@@ -380,3 +472,9 @@ def get_email_service() -> EmailService:
     if _email_service is None:
         _email_service = EmailService()
     return _email_service
+
+
+async def close_email_service():
+    """Close the email service connection if the singleton was created."""
+    if _email_service is not None:
+        await _email_service.close()
@@ -1,21 +1,24 @@
 """
-Excel Report Generator using openpyxl.
+Excel Report Generator using xlsxwriter.
 
 Generates professional Excel reports with multiple sheets, formatting, and charts.
+Workbooks are written in constant-memory mode, so only the current row of each
+sheet is held in RAM; rows must therefore be written top to bottom.
 """
 
+import asyncio
 from io import BytesIO
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
-from openpyxl import Workbook
-from openpyxl.styles import (
-    Font, Fill, PatternFill, Border, Side, Alignment,
-    NamedStyle
-)
-from openpyxl.utils import get_column_letter
-from openpyxl.chart import BarChart, PieChart, LineChart, Reference
-from openpyxl.formatting.rule import ColorScaleRule, FormulaRule
+import xlsxwriter
+
+
+@lru_cache(maxsize=None)
+def _key_path(key: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Split a dotted key once; template keys repeat for every row and report."""
+    return tuple(key.split(".")) if key else None
 
 
 class ExcelGenerator:
@@ -23,70 +26,68 @@ class ExcelGenerator:
     Generate Excel reports from templates and data.
     """
 
-    # Color definitions (hex without #)
+    # Color definitions
     COLORS = {
-        "primary": "FB923C",      # Orange
-        "primary_light": "FED7AA",
-        "success": "22C55E",      # Green
-        "success_light": "BBF7D0",
-        "warning": "F59E0B",      # Amber
-        "warning_light": "FDE68A",
-        "danger": "EF4444",       # Red
-        "danger_light": "FECACA",
-        "info": "3B82F6",         # Blue
-        "info_light": "BFDBFE",
-        "dark": "1F2937",
-        "light": "F3F4F6",
-        "white": "FFFFFF",
-        "header": "FB923C",       # Same as primary
+        "primary": "#FB923C",      # Orange
+        "primary_light": "#FED7AA",
+        "success": "#22C55E",      # Green
+        "success_light": "#BBF7D0",
+        "warning": "#F59E0B",      # Amber
+        "warning_light": "#FDE68A",
+        "danger": "#EF4444",       # Red
+        "danger_light": "#FECACA",
+        "info": "#3B82F6",         # Blue
+        "info_light": "#BFDBFE",
+        "dark": "#1F2937",
+        "light": "#F3F4F6",
+        "white": "#FFFFFF",
+        "header": "#FB923C",       # Same as primary
     }
 
     def __init__(self):
-        """Initialize Excel generator with styles."""
+        """Initialize Excel generator."""
         self.wb = None
-        self._setup_styles()
-
-    def _setup_styles(self):
-        """Set up named styles for reuse."""
-        # Header style
-        self.header_font = Font(bold=True, color="FFFFFF", size=11)
-        self.header_fill = PatternFill(start_color=self.COLORS["header"],
-                                       end_color=self.COLORS["header"],
-                                       fill_type="solid")
-        self.header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-
-        # Data styles
-        self.data_font = Font(size=10)
-        self.data_alignment = Alignment(horizontal="left", vertical="center")
-
-        # Number alignment
-        self.number_alignment = Alignment(horizontal="right", vertical="center")
-
-        # Border
-        self.thin_border = Border(
-            left=Side(style='thin', color=self.COLORS["light"]),
-            right=Side(style='thin', color=self.COLORS["light"]),
-            top=Side(style='thin', color=self.COLORS["light"]),
-            bottom=Side(style='thin', color=self.COLORS["light"])
-        )
-
-        # Title style
-        self.title_font = Font(bold=True, size=14, color=self.COLORS["dark"])
-        self.subtitle_font = Font(size=11, color="666666")
-
-        # Section header style
-        self.section_font = Font(bold=True, size=12, color=self.COLORS["primary"])
-
-        # Alternating row fill
-        self.alt_row_fill = PatternFill(start_color=self.COLORS["light"],
-                                        end_color=self.COLORS["light"],
-                                        fill_type="solid")
+        self.formats = {}
+
+    def _setup_formats(self):
+        """Create the cell formats for the current workbook."""
+        border = {"border": 1, "border_color": self.COLORS["light"]}
+        data = {"font_size": 10, "align": "left", "valign": "vcenter", **border}
+        number = {"font_size": 10, "align": "right", "valign": "vcenter", **border}
+        alt_fill = {"bg_color": self.COLORS["light"]}
+
+        specs = {
+            # Header style
+            "header": {
+                "bold": True, "font_color": "#FFFFFF", "font_size": 11,
+                "bg_color": self.COLORS["header"],
+                "align": "center", "valign": "vcenter", "text_wrap": True,
+                **border
+            },
+            # Data styles (plain and alternating row)
+            "data": data,
+            "data_alt": {**data, **alt_fill},
+            "number": number,
+            "number_alt": {**number, **alt_fill},
+            # Title styles
+            "title": {"bold": True, "font_size": 14, "font_color": self.COLORS["dark"]},
+            "subtitle": {"font_size": 11, "font_color": "#666666"},
+            # Section header style
+            "section": {"bold": True, "font_size": 12, "font_color": self.COLORS["primary"]},
+            # Summary label/value styles
+            "label": {"bold": True, "font_size": 10, **alt_fill},
+            "value": {"font_size": 10},
+            "bold": {"bold": True},
+        }
+
+        self.formats = {name: self.wb.add_format(spec) for name, spec in specs.items()}
 
     async def generate(
         self,
         template,
         data: Dict[str, Any],
-        include_charts: bool = True
+        include_charts: bool = True,
+        structure: Optional[List[Dict]] = None
     ) -> BytesIO:
         """
         Generate Excel report from template and data.
@@ -95,18 +96,29 @@ class ExcelGenerator:
             template: Report template instance
             data: Report data dictionary
             include_charts: Whether to include charts
+            structure: Precomputed sheet structure (defaults to the template's)
 
         Returns:
             BytesIO buffer containing the Excel file
         """
-        self.wb = Workbook()
+        # Building and zipping the workbook is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(self._generate_sync, template, data, include_charts, structure)
 
-        # Remove default sheet
-        default_sheet = self.wb.active
-        self.wb.remove(default_sheet)
+    def _generate_sync(
+        self,
+        template,
+        data: Dict[str, Any],
+        include_charts: bool,
+        structure: Optional[List[Dict]]
+    ) -> BytesIO:
+        """Build the workbook and return it as a buffer."""
+        buffer = BytesIO()
+        self.wb = xlsxwriter.Workbook(buffer, {"constant_memory": True})
+        self._setup_formats()
 
         # Get structure from template
-        structure = template.get_excel_structure()
+        if structure is None:
+            structure = template.get_excel_structure()
 
         # Process each sheet
         for sheet_def in structure:
@@ -116,8 +128,7 @@ class ExcelGenerator:
         self._add_metadata_sheet(template, data)
 
         # Save to buffer
-        buffer = BytesIO()
-        self.wb.save(buffer)
+        self.wb.close()
         buffer.seek(0)
 
         return buffer
@@ -127,7 +138,7 @@ class ExcelGenerator:
         sheet_name = sheet_def.get("name", "Sheet")
         sheet_type = sheet_def.get("type")
 
-        ws = self.wb.create_sheet(title=sheet_name[:31])  # Excel sheet name limit
+        ws = self.wb.add_worksheet(sheet_name[:31])  # Excel sheet name limit
 
         if sheet_type == "summary":
             self._build_summary_sheet(ws, sheet_def, data)
@@ -142,19 +153,28 @@ class ExcelGenerator:
 
     def _build_summary_sheet(self, ws, sheet_def: Dict, data: Dict):
         """Build a summary sheet with sections."""
-        row = 1
+        row = 0
+
+        # Set column widths
+        ws.set_column(0, 0, 30)
+        ws.set_column(1, 1, 40)
 
         # Title
-        ws.cell(row=row, column=1, value="Report Summary")
-        ws.cell(row=row, column=1).font = self.title_font
+        ws.write_string(row, 0, "Report Summary", self.formats["title"])
         row += 1
 
         # Date info
-        ws.cell(row=row, column=1, value=f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}")
-        ws.cell(row=row, column=1).font = self.subtitle_font
+        ws.write_string(
+            row, 0,
+            f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}",
+            self.formats["subtitle"]
+        )
         row += 2
 
         sections = sheet_def.get("sections", [])
+        section_format = self.formats["section"]
+        label_format = self.formats["label"]
+        value_format = self.formats["value"]
 
         for section in sections:
             section_title = section.get("title", "")
@@ -162,8 +182,7 @@ class ExcelGenerator:
             data_key = section.get("data_key")
 
             # Section header
-            ws.cell(row=row, column=1, value=section_title)
-            ws.cell(row=row, column=1).font = self.section_font
+            ws.write_string(row, 0, section_title, section_format)
             row += 1
 
             # Get data source
@@ -196,23 +215,13 @@ class ExcelGenerator:
                     value = "N/A"
 
                 # Write row
-                ws.cell(row=row, column=1, value=label)
-                ws.cell(row=row, column=1).font = Font(bold=True, size=10)
-                ws.cell(row=row, column=1).fill = PatternFill(start_color=self.COLORS["light"],
-                                                              end_color=self.COLORS["light"],
-                                                              fill_type="solid")
-
-                ws.cell(row=row, column=2, value=str(value))
-                ws.cell(row=row, column=2).font = self.data_font
+                ws.write_string(row, 0, str(label), label_format)
+                ws.write_string(row, 1, str(value), value_format)
 
                 row += 1
 
             row += 1  # Space between sections
 
-        # Set column widths
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 40
-
     def _build_data_table_sheet(self, ws, sheet_def: Dict, data: Dict, include_charts: bool):
         """Build a data table sheet."""
         data_key = sheet_def.get("data_key")
@@ -220,25 +229,22 @@ class ExcelGenerator:
 
         table_data = self._get_nested_value(data, data_key)
         if not table_data or not isinstance(table_data, list):
-            ws.cell(row=1, column=1, value="No data available")
+            ws.write_string(0, 0, "No data available")
             return
 
         # Write header row
-        for col_idx, col_def in enumerate(columns, 1):
-            cell = ws.cell(row=1, column=col_idx, value=col_def.get("label", col_def.get("key")))
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = self.header_alignment
-            cell.border = self.thin_border
+        self._write_header(ws, columns, default_width=15)
 
-            # Set column width
-            ws.column_dimensions[get_column_letter(col_idx)].width = col_def.get("width", 15)
+        # Alternating row colors, indexed by row parity
+        row_formats = (self.formats["data"], self.formats["data_alt"])
+        paths = [_key_path(col_def.get("key")) for col_def in columns]
 
         # Write data rows
-        for row_idx, row_data in enumerate(table_data, 2):
-            for col_idx, col_def in enumerate(columns, 1):
-                key = col_def.get("key")
-                value = self._get_nested_value(row_data, key)
+        for row_idx, row_data in enumerate(table_data, 1):
+            cell_format = row_formats[row_idx % 2]
+
+            for col_idx, path in enumerate(paths):
+                value = self._get_path(row_data, path)
 
                 # Format value
                 if isinstance(value, datetime):
@@ -248,23 +254,16 @@ class ExcelGenerator:
                 elif value is None:
                     value = "-"
 
-                cell = ws.cell(row=row_idx, column=col_idx, value=str(value) if value else "-")
-                cell.font = self.data_font
-                cell.alignment = self.data_alignment
-                cell.border = self.thin_border
-
-                # Alternating row colors
-                if row_idx % 2 == 0:
-                    cell.fill = self.alt_row_fill
+                ws.write_string(row_idx, col_idx, str(value) if value else "-", cell_format)
 
         # Apply conditional formatting if specified
         cond_format = sheet_def.get("conditional_format")
         if cond_format:
-            self._apply_conditional_formatting(ws, cond_format, columns, len(table_data) + 1)
+            self._apply_conditional_formatting(ws, cond_format, columns, len(table_data))
 
         # Add chart if requested
         if include_charts and sheet_def.get("include_chart"):
-            self._add_chart_to_sheet(ws, len(table_data) + 1, columns, table_data)
+            self._add_chart_to_sheet(ws, len(table_data), columns, table_data)
 
     def _build_dict_table_sheet(self, ws, sheet_def: Dict, data: Dict):
         """Build a table from a dictionary."""
@@ -273,35 +272,20 @@ class ExcelGenerator:
 
         dict_data = self._get_nested_value(data, data_key)
         if not dict_data or not isinstance(dict_data, dict):
-            ws.cell(row=1, column=1, value="No data available")
+            ws.write_string(0, 0, "No data available")
             return
 
         # Write header row
-        for col_idx, col_def in enumerate(columns, 1):
-            cell = ws.cell(row=1, column=col_idx, value=col_def.get("label", col_def.get("key")))
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = self.header_alignment
-            cell.border = self.thin_border
-            ws.column_dimensions[get_column_letter(col_idx)].width = col_def.get("width", 20)
-
-        # Write data rows
-        row_idx = 2
-        for key, value in dict_data.items():
-            ws.cell(row=row_idx, column=1, value=str(key))
-            ws.cell(row=row_idx, column=1).font = self.data_font
-            ws.cell(row=row_idx, column=1).border = self.thin_border
-
-            ws.cell(row=row_idx, column=2, value=value)
-            ws.cell(row=row_idx, column=2).font = self.data_font
-            ws.cell(row=row_idx, column=2).border = self.thin_border
-            ws.cell(row=row_idx, column=2).alignment = self.number_alignment
+        self._write_header(ws, columns, default_width=20)
 
-            if row_idx % 2 == 0:
-                ws.cell(row=row_idx, column=1).fill = self.alt_row_fill
-                ws.cell(row=row_idx, column=2).fill = self.alt_row_fill
+        # Alternating row colors, indexed by row parity
+        key_formats = (self.formats["data"], self.formats["data_alt"])
+        value_formats = (self.formats["number"], self.formats["number_alt"])
 
-            row_idx += 1
+        # Write data rows
+        for row_idx, (key, value) in enumerate(dict_data.items(), 1):
+            ws.write_string(row_idx, 0, str(key), key_formats[row_idx % 2])
+            self._write_value(ws, row_idx, 1, value, value_formats[row_idx % 2])
 
     def _build_shift_comparison_sheet(self, ws, sheet_def: Dict, data: Dict, include_charts: bool):
         """Build shift comparison table."""
@@ -311,7 +295,7 @@ class ExcelGenerator:
         shift_data = self._get_nested_value(data, data_key)
 
         if not shift_data:
-            ws.cell(row=1, column=1, value="No shift data available")
+            ws.write_string(0, 0, "No shift data available")
             return
 
         # Convert dict to list if needed
@@ -324,36 +308,30 @@ class ExcelGenerator:
             table_data = shift_data
 
         # Write header row
-        for col_idx, col_def in enumerate(columns, 1):
-            cell = ws.cell(row=1, column=col_idx, value=col_def.get("label", col_def.get("key")))
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = self.header_alignment
-            cell.border = self.thin_border
-            ws.column_dimensions[get_column_letter(col_idx)].width = col_def.get("width", 15)
+        self._write_header(ws, columns, default_width=15)
+
+        # Alternating row colors, indexed by row parity
+        row_formats = (self.formats["data"], self.formats["data_alt"])
+        keys = [col_def.get("key") for col_def in columns]
+        paths = [_key_path(key) for key in keys]
 
         # Write data rows
-        for row_idx, row_data in enumerate(table_data, 2):
-            for col_idx, col_def in enumerate(columns, 1):
-                key = col_def.get("key")
-                value = self._get_nested_value(row_data, key)
+        for row_idx, row_data in enumerate(table_data, 1):
+            cell_format = row_formats[row_idx % 2]
+
+            for col_idx, (key, path) in enumerate(zip(keys, paths)):
+                value = self._get_path(row_data, path)
 
                 if value is None:
                     value = "-"
                 elif key == "shift":
                     value = str(value).title()
 
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                cell.font = self.data_font
-                cell.alignment = self.data_alignment
-                cell.border = self.thin_border
-
-                if row_idx % 2 == 0:
-                    cell.fill = self.alt_row_fill
+                self._write_value(ws, row_idx, col_idx, value, cell_format)
 
         # Add chart
         if include_charts and len(table_data) > 0:
-            self._add_shift_chart(ws, len(table_data) + 1, table_data)
+            self._add_shift_chart(ws, len(table_data))
 
     def _build_list_sheet(self, ws, sheet_def: Dict, data: Dict):
         """Build a simple list sheet."""
@@ -362,22 +340,20 @@ class ExcelGenerator:
 
         list_data = self._get_nested_value(data, data_key)
 
-        ws.cell(row=1, column=1, value=title)
-        ws.cell(row=1, column=1).font = self.section_font
+        ws.set_column(0, 0, 50)
+        ws.write_string(0, 0, title, self.formats["section"])
 
         if not list_data:
-            ws.cell(row=3, column=1, value="No items")
+            ws.write_string(2, 0, "No items")
             return
 
-        for idx, item in enumerate(list_data, 3):
-            ws.cell(row=idx, column=1, value=f"• {item}")
-            ws.cell(row=idx, column=1).font = self.data_font
-
-        ws.column_dimensions['A'].width = 50
+        value_format = self.formats["value"]
+        for idx, item in enumerate(list_data, 2):
+            ws.write_string(idx, 0, f"• {item}", value_format)
 
     def _add_metadata_sheet(self, template, data: Dict):
         """Add a metadata sheet with report info."""
-        ws = self.wb.create_sheet(title="Report Info")
+        ws = self.wb.add_worksheet("Report Info")
 
         metadata = [
             ("Report Type", template.report_name),
@@ -387,13 +363,28 @@ class ExcelGenerator:
             ("System", "Mine Safety PPE Detection System"),
         ]
 
-        for row_idx, (label, value) in enumerate(metadata, 1):
-            ws.cell(row=row_idx, column=1, value=label)
-            ws.cell(row=row_idx, column=1).font = Font(bold=True)
-            ws.cell(row=row_idx, column=2, value=str(value))
-
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 40
+        ws.set_column(0, 0, 20)
+        ws.set_column(1, 1, 40)
+
+        for row_idx, (label, value) in enumerate(metadata):
+            ws.write_string(row_idx, 0, label, self.formats["bold"])
+            ws.write_string(row_idx, 1, str(value))
+
+    def _write_header(self, ws, columns: List, default_width: int):
+        """Write the header row and set column widths."""
+        header_format = self.formats["header"]
+        for col_idx, col_def in enumerate(columns):
+            ws.set_column(col_idx, col_idx, col_def.get("width", default_width))
+            ws.write_string(0, col_idx, str(col_def.get("label", col_def.get("key"))), header_format)
+
+    def _write_value(self, ws, row: int, col: int, value, cell_format):
+        """Write a cell keeping numbers numeric and everything else as text."""
+        if isinstance(value, bool):
+            ws.write_boolean(row, col, value, cell_format)
+        elif isinstance(value, (int, float)):
+            ws.write_number(row, col, value, cell_format)
+        else:
+            ws.write_string(row, col, str(value), cell_format)
 
     def _apply_conditional_formatting(self, ws, cond_format: Dict, columns: List, last_row: int):
         """Apply conditional formatting to a column."""
@@ -402,29 +393,24 @@ class ExcelGenerator:
 
         # Find column index
         col_idx = None
-        for idx, col in enumerate(columns, 1):
+        for idx, col in enumerate(columns):
             if col.get("key") == column_name:
                 col_idx = idx
                 break
 
-        if not col_idx:
+        if col_idx is None:
             return
 
-        col_letter = get_column_letter(col_idx)
-        cell_range = f"{col_letter}2:{col_letter}{last_row}"
-
         # Apply color scale for numeric columns
         if any("< " in str(r.get("condition", "")) or "> " in str(r.get("condition", "")) for r in rules):
-            rule = ColorScaleRule(
-                start_type='min',
-                start_color='22C55E',  # Green
-                mid_type='percentile',
-                mid_value=50,
-                mid_color='F59E0B',    # Amber
-                end_type='max',
-                end_color='EF4444'     # Red
-            )
-            ws.conditional_formatting.add(cell_range, rule)
+            ws.conditional_format(1, col_idx, last_row, col_idx, {
+                "type": "3_color_scale",
+                "min_color": self.COLORS["success"],   # Green
+                "mid_type": "percentile",
+                "mid_value": 50,
+                "mid_color": self.COLORS["warning"],   # Amber
+                "max_color": self.COLORS["danger"],    # Red
+            })
 
     def _add_chart_to_sheet(self, ws, data_end_row: int, columns: List, table_data: List):
         """Add a bar chart to a data table sheet."""
@@ -433,62 +419,61 @@ class ExcelGenerator:
 
         # Find numeric column for chart
         value_col = None
-        label_col = 1
+        label_col = 0
 
-        for idx, col in enumerate(columns, 1):
+        for idx, col in enumerate(columns):
             key = col.get("key", "")
             if "rate" in key.lower() or "count" in key.lower() or "total" in key.lower():
                 value_col = idx
                 break
 
-        if not value_col:
-            value_col = 2  # Default to second column
+        if value_col is None:
+            value_col = 1  # Default to second column
 
-        chart = BarChart()
-        chart.type = "col"
-        chart.style = 10
-        chart.title = "Data Visualization"
+        chart = self.wb.add_chart({"type": "column"})
+        chart.set_style(10)
+        chart.set_title({"name": "Data Visualization"})
 
-        data = Reference(ws, min_col=value_col, min_row=1, max_row=data_end_row)
-        labels = Reference(ws, min_col=label_col, min_row=2, max_row=data_end_row)
+        chart.add_series({
+            "name": [ws.name, 0, value_col],
+            "categories": [ws.name, 1, label_col, data_end_row, label_col],
+            "values": [ws.name, 1, value_col, data_end_row, value_col],
+        })
 
-        chart.add_data(data, titles_from_data=True)
-        chart.set_categories(labels)
+        chart.set_size({"width": 567, "height": 302})  # 15 x 8 cm
 
-        chart.width = 15
-        chart.height = 8
+        ws.insert_chart(data_end_row + 3, 0, chart)
 
-        ws.add_chart(chart, f"A{data_end_row + 3}")
-
-    def _add_shift_chart(self, ws, data_end_row: int, table_data: List):
+    def _add_shift_chart(self, ws, data_end_row: int):
         """Add a chart for shift comparison."""
-        chart = BarChart()
-        chart.type = "col"
-        chart.style = 10
-        chart.title = "Shift Performance"
-        chart.y_axis.title = "Compliance %"
+        chart = self.wb.add_chart({"type": "column"})
+        chart.set_style(10)
+        chart.set_title({"name": "Shift Performance"})
+        chart.set_y_axis({"name": "Compliance %"})
 
         # Assuming compliance_rate is in column 4
-        data = Reference(ws, min_col=4, min_row=1, max_row=data_end_row)
-        labels = Reference(ws, min_col=1, min_row=2, max_row=data_end_row)
-
-        chart.add_data(data, titles_from_data=True)
-        chart.set_categories(labels)
+        chart.add_series({
+            "name": [ws.name, 0, 3],
+            "categories": [ws.name, 1, 0, data_end_row, 0],
+            "values": [ws.name, 1, 3, data_end_row, 3],
+        })
 
-        chart.width = 12
-        chart.height = 7
+        chart.set_size({"width": 454, "height": 265})  # 12 x 7 cm
 
-        ws.add_chart(chart, f"A{data_end_row + 3}")
+        ws.insert_chart(data_end_row + 3, 0, chart)
 
     def _get_nested_value(self, data: Dict, key: str):
         """Get a nested value from a dictionary using dot notation."""
-        if not key or not data:
+        return self._get_path(data, _key_path(key))
+
+    @staticmethod
+    def _get_path(data: Dict, path: Optional[Tuple[str, ...]]):
+        """Get a nested value from a dictionary using a pre-split key."""
+        if not path or not data:
             return None
 
-        keys = key.split(".")
         value = data
-
-        for k in keys:
+        for k in path:
             if isinstance(value, dict):
                 value = value.get(k)
             else:
@@ -883,3 +883,15 @@ class PDFGenerator:
                 return None
 
         return value
+
+
+# Singleton instance (styles are built once; generate() keeps no per-report state)
+_pdf_generator: Optional[PDFGenerator] = None
+
+
+def get_pdf_generator() -> PDFGenerator:
+    """Get or create the PDF generator singleton."""
+    global _pdf_generator
+    if _pdf_generator is None:
+        _pdf_generator = PDFGenerator()
+    return _pdf_generator
@@ -0,0 +1,221 @@
+"""
+Generated report cache.
+
+Stores rendered report bytes plus a little metadata under the report ID so
+they can be downloaded later. Uses Redis when REDIS_URL is configured (shared
+across workers and replicas), otherwise an in-process TTL cache for
+single-worker development.
+
+Queued report jobs are tracked here too, so REDIS_URL is required whenever
+the API runs more than one worker process; otherwise status and download
+requests can land on a worker that never saw the job.
+"""
+
+import os
+from datetime import datetime
+from typing import Optional, Dict, Any
+from urllib.parse import urlsplit
+
+from cachetools import TTLCache
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    print("Warning: redis package not installed. Report cache will be in-process only.")
+
+
+class ReportCache:
+    """
+    Key/value store for generated reports with automatic expiry.
+
+    Keys follow ``reports:{report_id}:data`` / ``reports:{report_id}:meta``.
+    """
+
+    KEY_PREFIX = "reports"
+
+    def __init__(self):
+        """Initialize from environment configuration."""
+        self.ttl = int(os.getenv("REPORT_CACHE_TTL", "3600"))
+        self.max_entries = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "256"))
+        self.max_jobs = int(os.getenv("REPORT_CACHE_MAX_JOBS", "10000"))
+        redis_url = os.getenv("REDIS_URL", "")
+
+        self._redis = None
+        self._local = None
+        self._local_meta = None
+
+        if redis_url and REDIS_AVAILABLE:
+            self._redis = aioredis.from_url(redis_url)
+            print(f"[ReportCache] Using Redis at {self._redis_location(redis_url)} (ttl={self.ttl}s)")
+        else:
+            workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+            if workers > 1:
+                raise RuntimeError(
+                    f"REDIS_URL (and the redis package) is required with WEB_CONCURRENCY={workers}: "
+                    "the in-process report cache is not shared between workers"
+                )
+
+            # Report contents are bounded by count; job metadata is small and
+            # gets its own, larger bound so pending jobs aren't evicted by
+            # finished reports
+            self._local = TTLCache(maxsize=self.max_entries, ttl=self.ttl)
+            self._local_meta = TTLCache(maxsize=self.max_jobs, ttl=self.ttl)
+            print(f"[ReportCache] Using in-process cache (ttl={self.ttl}s, max {self.max_entries} reports)")
+
+    @staticmethod
+    def _redis_location(redis_url: str) -> str:
+        """Host and port of a Redis URL, leaving out any credentials."""
+        parts = urlsplit(redis_url)
+        if not parts.hostname:
+            return parts.path or "(unknown)"
+        return f"{parts.hostname}:{parts.port or 6379}"
+
+    def _data_key(self, report_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{report_id}:data"
+
+    def _meta_key(self, report_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{report_id}:meta"
+
+    async def set(
+        self,
+        report_id: str,
+        data: bytes,
+        filename: str,
+        content_type: str,
+        format: str
+    ):
+        """
+        Store a generated report.
+
+        Args:
+            report_id: Report ID
+            data: Report file contents
+            filename: Download filename
+            content_type: MIME type of the report
+            format: File extension (pdf, xlsx, csv)
+        """
+        meta = {
+            "status": "ready",
+            "filename": filename,
+            "content_type": content_type,
+            "format": format,
+            "created_at": datetime.utcnow().isoformat()
+        }
+
+        if self._redis is not None:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.set(self._data_key(report_id), data, ex=self.ttl)
+                pipe.hset(self._meta_key(report_id), mapping=meta)
+                pipe.expire(self._meta_key(report_id), self.ttl)
+                await pipe.execute()
+        else:
+            self._local[report_id] = data
+            self._local_meta[report_id] = meta
+
+    async def set_status(self, report_id: str, status: str, **fields):
+        """
+        Record the status of a report that has no contents yet.
+
+        Args:
+            report_id: Report ID
+            status: pending, ready or failed
+            **fields: Extra string metadata (filename, error, ...)
+        """
+        meta = {"status": status, **{k: str(v) for k, v in fields.items()}}
+
+        if self._redis is not None:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.hset(self._meta_key(report_id), mapping=meta)
+                pipe.expire(self._meta_key(report_id), self.ttl)
+                await pipe.execute()
+        else:
+            self._local_meta[report_id] = {**self._local_meta.get(report_id, {}), **meta}
+
+    async def get_meta(self, report_id: str) -> Optional[Dict[str, Any]]:
+        """Get report metadata (including status) without the contents."""
+        if self._redis is not None:
+            meta = await self._redis.hgetall(self._meta_key(report_id))
+            if not meta:
+                return None
+            return {k.decode(): v.decode() for k, v in meta.items()}
+
+        meta = self._local_meta.get(report_id)
+        if meta is None:
+            return None
+        # A ready report whose contents were evicted is gone
+        if meta.get("status") == "ready" and report_id not in self._local:
+            return None
+        return dict(meta)
+
+    async def get(self, report_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached report.
+
+        Returns:
+            Dict with 'data' bytes and metadata, or None if missing/expired
+        """
+        if self._redis is not None:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.get(self._data_key(report_id))
+                pipe.hgetall(self._meta_key(report_id))
+                data, meta = await pipe.execute()
+
+            if data is None or not meta:
+                return None
+
+            return {
+                "data": data,
+                **{k.decode(): v.decode() for k, v in meta.items()}
+            }
+
+        data = self._local.get(report_id)
+        meta = self._local_meta.get(report_id)
+        if data is None or meta is None:
+            return None
+        return {"data": data, **meta}
+
+    async def get_bytes(self, report_id: str) -> Optional[bytes]:
+        """Get only the cached report contents."""
+        if self._redis is not None:
+            return await self._redis.get(self._data_key(report_id))
+
+        return self._local.get(report_id)
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Get cache pressure figures: backend, report count and stored bytes.
+
+        With Redis this scans the report keys, so keep it off hot paths.
+        """
+        if self._redis is not None:
+            entries = 0
+            total_bytes = 0
+            async for key in self._redis.scan_iter(match=f"{self.KEY_PREFIX}:*:data", count=500):
+                entries += 1
+                total_bytes += await self._redis.strlen(key)
+        else:
+            self._local.expire()
+            reports = list(self._local.values())
+            entries = len(reports)
+            total_bytes = sum(len(data) for data in reports)
+
+        return {
+            "backend": "redis" if self._redis is not None else "memory",
+            "ttl_seconds": self.ttl,
+            "entries": entries,
+            "bytes": total_bytes
+        }
+
+
+# Singleton instance
+_report_cache: Optional[ReportCache] = None
+
+
+def get_report_cache() -> ReportCache:
+    """Get or create the report cache singleton."""
+    global _report_cache
+    if _report_cache is None:
+        _report_cache = ReportCache()
+    return _report_cache
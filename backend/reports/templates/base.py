@@ -3,7 +3,7 @@ Base template class for all report templates.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from ..schemas import ReportType, ReportFormat
 
@@ -65,6 +65,30 @@ class BaseReportTemplate(ABC):
         """
         pass
 
+    def aggregate_data_cursor(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        mine_id: Optional[str] = None,
+        filters: Dict[str, Any] = None
+    ) -> Optional[Tuple[List[Dict[str, Any]], Any]]:
+        """
+        Get the report's main table as an async row iterator for streaming export.
+
+        Templates whose main table can grow without bound override this.
+
+        Args:
+            start_date: Report start date
+            end_date: Report end date
+            mine_id: Optional mine ID filter
+            filters: Additional filters
+
+        Returns:
+            Tuple of (column definitions, async iterable of formatted rows), or None if the
+            report cannot be streamed
+        """
+        return None
+
     @abstractmethod
     def get_pdf_structure(self) -> List[Dict[str, Any]]:
         """
@@ -57,6 +57,30 @@ class ShiftInchargeTemplate(BaseReportTemplate):
             **summary
         }
 
+    def aggregate_data_cursor(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        mine_id: Optional[str] = None,
+        filters: Dict[str, Any] = None
+    ):
+        """Stream the full entry/exit log for the date range."""
+        from ..services.data_aggregator import DataAggregator
+
+        filters = filters or {}
+        rows = DataAggregator(self.db).iter_entry_exit_log(
+            mine_id=mine_id,
+            start_date=start_date,
+            end_date=end_date,
+            gate_id=filters.get("gate_id")
+        )
+
+        columns = next(
+            sheet["columns"] for sheet in self.get_excel_structure()
+            if sheet.get("data_key") == "entry_exit_logs"
+        )
+        return columns, rows
+
     def get_pdf_structure(self) -> List[Dict[str, Any]]:
         """Define PDF layout for shift summary."""
         return [
@@ -284,6 +284,7 @@ async def detect_and_record_entry(
             "safety_shoes": "NO Safety Shoes" not in violation_labels,
         },
         "violations": violation_labels,
+        "ppe_compliant": not violation_labels,
         "timestamp": datetime.utcnow(),
         "shift": current_shift.value,
         "image": f"data:image/png;base64,{img_base64}",
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from motor.motor_asyncio import AsyncIOMotorClient
 from passlib.context import CryptContext
 from dotenv import load_dotenv
+from reports.services.data_aggregator import DataAggregator
 
 load_dotenv()
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/sih_safety_system")
@@ -154,6 +155,8 @@ async def seed():
                 gas += 1
     
     print(f"DONE! Mines:3 Users:15 Workers:60 Entries:{entries} Alerts:{alerts} Gas:{gas}")
+    # Historical gate entries changed; rebuild the report rollups from them
+    await DataAggregator(db).reset_daily_rollups()
     client.close()
 
 if __name__ == "__main__":
@@ -12,6 +12,7 @@ import bcrypt
 from bson import ObjectId
 import os
 from dotenv import load_dotenv
+from reports.services.data_aggregator import DataAggregator
 
 load_dotenv()
 
@@ -576,6 +577,9 @@ async def seed_database():
     print(f"Gate Entries: {len(entries)}")
     print(f"Alerts: {len(alerts)}")
 
+    # Historical gate entries changed; rebuild the report rollups from them
+    await DataAggregator(db).reset_daily_rollups()
+
     client.close()
     print("\nDone!")
 
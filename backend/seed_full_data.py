@@ -15,6 +15,7 @@ from bson import ObjectId
 import os
 import random
 from dotenv import load_dotenv
+from reports.services.data_aggregator import DataAggregator
 
 load_dotenv()
 
@@ -114,6 +115,9 @@ async def seed_database():
     # Print summary
     await print_summary(db)
 
+    # Historical gate entries changed; rebuild the report rollups from them
+    await DataAggregator(db).reset_daily_rollups()
+
     client.close()
     print("\nDone!")
 
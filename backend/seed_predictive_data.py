@@ -15,6 +15,7 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from bson import ObjectId
 import os
 from dotenv import load_dotenv
+from reports.services.data_aggregator import DataAggregator
 
 load_dotenv()
 
@@ -281,6 +282,9 @@ async def seed_predictive_data():
     print(f"Workers processed: {len(workers)}")
     print(f"Time period: {start_date.date()} to {end_date.date()} (180 days)")
 
+    # Historical gate entries changed; rebuild the report rollups from them
+    await DataAggregator(db).reset_daily_rollups()
+
     client.close()
 
 
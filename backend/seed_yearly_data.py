@@ -19,6 +19,7 @@ import os
 import random
 import math
 from dotenv import load_dotenv
+from reports.services.data_aggregator import DataAggregator
 import time
 
 load_dotenv()
@@ -91,6 +92,9 @@ async def seed_yearly_data():
     # Print summary
     await print_summary(db)
 
+    # Historical gate entries changed; rebuild the report rollups from them
+    await DataAggregator(db).reset_daily_rollups()
+
     client.close()
     print("\n[DONE] Yearly data seeding complete!")
 
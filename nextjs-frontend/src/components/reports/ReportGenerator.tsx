@@ -61,6 +61,9 @@ export default function ReportGenerator({
 
       const response = await reportsApi.generateReport(request);
 
+      // Generation is queued server-side; wait until it's ready
+      await reportsApi.waitForReport(response.report_id);
+
       // Download the file
       const blob = await reportsApi.downloadReport(response.report_id);
       const url = window.URL.createObjectURL(blob);
@@ -41,6 +41,7 @@ import type {
   ReportTypeInfo,
   GenerateReportRequest,
   GenerateReportResponse,
+  ReportStatus,
   ReportSchedule,
   CreateScheduleRequest,
   UpdateScheduleRequest,
@@ -744,6 +745,24 @@ export const reportsApi = {
     return response.data as GenerateReportResponse;
   },
 
+  getReportStatus: async (reportId: string): Promise<ReportStatus> => {
+    const response = await api.get(`/reports/status/${reportId}`);
+    return response.data as ReportStatus;
+  },
+
+  // Poll until a queued report is ready (or failed)
+  waitForReport: async (reportId: string, intervalMs = 1000, maxAttempts = 300): Promise<ReportStatus> => {
+    for (let attempt = 0; attempt < maxAttempts; attempt++) {
+      const status: ReportStatus = await reportsApi.getReportStatus(reportId);
+      if (status.status === 'ready') return status;
+      if (status.status === 'failed') {
+        throw new Error(status.error || 'Report generation failed');
+      }
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+    throw new Error('Timed out waiting for report');
+  },
+
   downloadReport: async (reportId: string): Promise<Blob> => {
     const response = await api.get(`/reports/download/${reportId}`, {
       responseType: 'blob'
@@ -860,6 +860,7 @@ export interface GenerateReportRequest {
 export interface GenerateReportResponse {
   success: boolean;
   report_id: string;
+  status?: ReportStatusValue;
   download_url?: string;
   file_name: string;
   format: ReportFormat;
@@ -867,6 +868,16 @@ export interface GenerateReportResponse {
   message: string;
 }
 
+export type ReportStatusValue = 'pending' | 'ready' | 'failed';
+
+export interface ReportStatus {
+  report_id: string;
+  status: ReportStatusValue;
+  file_name?: string;
+  download_url?: string;
+  error?: string;
+}
+
 export interface ReportSchedule {
   id: string;
   name: string;